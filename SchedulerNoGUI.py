@@ -2,9 +2,13 @@
 
 import sys
 import copy
+import heapq
+import random
 from abc import ABC, abstractmethod
 from collections import deque
 
+from strategy_registry import StrategyRegistry, StrategySpec
+
 """
 DEPARTAMENTO DE COMPUTAÇÃO
 UNIVERSIDADE FEDERAL DO CEARÁ
@@ -19,27 +23,43 @@ class Process:
     Armazena o estado de um único processo, conforme descrito
     nas diretrizes de entrada.
     """
-    def __init__(self, id, creation_time, duration, priority):
+    def __init__(self, id, creation_time, duration, priority, tickets=None, bursts=None):
         self.id = id  # (implícito)
         self.creation_time = int(creation_time)  #
-        self.duration = int(duration)  #
         self.static_priority = int(priority)  #
+        # Bilhetes para Stride/Lottery (None = derivado da prioridade)
+        self.tickets = int(tickets) if tickets is not None else None
+
+        # Rajadas alternadas [CPU, E/S, CPU, ...]. Sem 'bursts' o processo
+        # é puramente CPU-bound, com uma única rajada igual à duração.
+        self.bursts = [int(b) for b in bursts] if bursts else [int(duration)]
+        if len(self.bursts) % 2 == 0:
+            raise ValueError(f"Rajadas de {id} devem começar e terminar com CPU.")
+        if any(b <= 0 for b in self.bursts):
+            raise ValueError(f"Rajadas de {id} devem ser positivas.")
+        self.duration = sum(self.bursts[0::2])  # Total de CPU
+        self.io_time = sum(self.bursts[1::2])  # Total de E/S
 
         # Estado dinâmico para simulação
         self.remaining_time = self.duration
+        self.burst_index = 0  # Rajada de CPU atual (índice em 'bursts')
+        self.burst_remaining = self.bursts[0]
+        self.wake_time = 0  # Fim da E/S em andamento
         self.current_priority = self.static_priority
         self.start_time = -1  # Hora que executou pela 1ª vez
         self.completion_time = 0
         self.turnaround_time = 0  #
         self.waiting_time = 0  #
         self.quantum_slice = 0  # Para Round-Robin
-        self.status = 'new'  # (sugestão de status)
+        self.status = 'new'  # new, ready, running, blocked, completed
 
     def clone(self):
         """Cria uma cópia limpa do processo para uma nova simulação."""
         return copy.deepcopy(self)
 
     def __repr__(self):
+        if len(self.bursts) > 1:
+            return f"Process({self.id}, CT:{self.creation_time}, B:{self.bursts}, P:{self.static_priority})"
         return f"Process({self.id}, CT:{self.creation_time}, D:{self.duration}, P:{self.static_priority})"
 
 # --- Função de Desempate ---
@@ -67,6 +87,198 @@ def _tie_break(eligible_processes, running_process):
     # (iii) escolha aleatória (usamos ID para ser determinístico)
     return sorted(tied_on_remaining, key=lambda p: p.id)[0]
 
+# --- Bilhetes para escalonamento proporcional ---
+DEFAULT_TICKETS = 100  # Bilhetes de um processo com prioridade 0
+STRIDE1 = 1 << 20  # Constante do Stride (passo = STRIDE1 / bilhetes)
+
+def _tickets_for(process):
+    """
+    Retorna os bilhetes do processo: explícitos, se informados, ou
+    derivados da prioridade estática (MENOR número = MAIS bilhetes).
+    """
+    if process.tickets is not None:
+        return max(1, process.tickets)
+    return max(1, DEFAULT_TICKETS // (1 + max(0, process.static_priority)))
+
+
+# --- Estado de uma Execução ---
+
+class SimulationCancelled(Exception):
+    """Lançada pelo monitor de uma execução para interrompê-la."""
+
+# Eventos do trace de uma execução: (instante, tipo, id[, valor])
+DISPATCH, PREEMPT, BLOCK, COMPLETE, AGING = 'D', 'P', 'B', 'C', 'A'
+
+class SimulationRun:
+    """
+    Estado compartilhado por todos os loops de simulação: fila de chegadas,
+    fila de eventos de E/S (despertares), diagrama e estatísticas da CPU.
+    Pode ser passado a schedule() para consultar os resultados extras
+    (tempo ocioso da CPU, makespan) após a execução.
+    Com diagram=False só as métricas são calculadas (sem diagrama).
+    Com format=False o diagrama é gravado em 'diagram_data' (ex: para o
+    índice da linha do tempo), mas o texto do diagrama não é montado.
+    Se houver 'monitor', ele é chamado a cada 'report_interval' unidades de
+    tempo com este objeto (ver 'progress') e pode lançar SimulationCancelled.
+    Com 'trace' (uma lista, ou qualquer objeto com append) são gravados os
+    eventos de ocupação da CPU: despacho, preempção, bloqueio e término
+    (ver tracing.py). Um processo que ganha outro quantum sem que ninguém
+    ocupe a CPU no meio não gera eventos.
+    """
+    def __init__(self, diagram=True, monitor=None, report_interval=1024, trace=None, format=True):
+        self.diagram = diagram
+        self.format = format
+        self.monitor = monitor
+        self.report_interval = report_interval
+        self.trace = trace
+        self.cpu_idle_time = 0
+        self.makespan = 0
+
+    def start(self, processes):
+        """Prepara o estado para simular a lista de processos informada."""
+        self.pids = sorted([p.id for p in processes])
+        self.diagram_data = {pid: [] for pid in self.pids}
+        self.process_map = {p.id: p for p in processes}
+        # Fila de processos que ainda não chegaram
+        self.process_queue = deque(sorted(processes, key=lambda p: (p.creation_time, p.id)))
+        # Eventos de fim de E/S: heap de (instante de despertar, id, processo)
+        self.io_events = []
+        self.completed = []
+        self.current_time = 0
+        self.cpu_idle_time = 0
+        self.makespan = 0
+        self.total_cpu = sum(p.remaining_time for p in processes)
+        self.cpu_done = 0
+        self._next_report = self.report_interval
+        # Último processo a ocupar a CPU (para o trace) e fim da sua unidade
+        self._occupant = None
+        self._occupant_end = 0
+
+    @property
+    def progress(self):
+        """Fração do trabalho de CPU já executada (0.0 a 1.0)."""
+        if self.total_cpu == 0:
+            return 1.0
+        return self.cpu_done / self.total_cpu
+
+    @property
+    def cpu_utilization(self):
+        """Fração do makespan em que a CPU esteve ocupada."""
+        if self.makespan == 0:
+            return 0.0
+        return (self.makespan - self.cpu_idle_time) / self.makespan
+
+    def admit(self, add):
+        """
+        Entrega a 'add' (ex: ready_queue.append) os processos que chegam
+        agora e os que terminaram sua rajada de E/S.
+        """
+        while self.process_queue and self.process_queue[0].creation_time <= self.current_time:
+            new_p = self.process_queue.popleft()
+            new_p.status = 'ready'
+            add(new_p)
+        while self.io_events and self.io_events[0][0] <= self.current_time:
+            _, _, woken = heapq.heappop(self.io_events)
+            woken.status = 'ready'
+            add(woken)
+
+    def pending(self):
+        """Indica se ainda há chegadas ou despertares de E/S no futuro."""
+        return bool(self.process_queue or self.io_events)
+
+    def skip_idle(self):
+        """CPU ociosa e sem prontos: salta o tempo até o próximo evento."""
+        next_event = self._next_event_time()
+        if self.diagram:
+            for _ in range(next_event - self.current_time):
+                self.record_tick(None, ())
+        self.cpu_idle_time += next_event - self.current_time
+        self.current_time = next_event
+        if self.monitor is not None and self.current_time >= self._next_report:
+            self._report()
+
+    def _next_event_time(self):
+        times = []
+        if self.process_queue:
+            times.append(self.process_queue[0].creation_time)
+        if self.io_events:
+            times.append(self.io_events[0][0])
+        return min(times)
+
+    def record_tick(self, running_process, ready_processes):
+        """Grava no diagrama o estado de cada processo na unidade atual."""
+        if not self.diagram:
+            return
+        ready_pids = {p.id for p in ready_processes}
+        for pid in self.pids:
+            if running_process is not None and pid == running_process.id:
+                self.diagram_data[pid].append('##') # Em execução
+            elif pid in ready_pids:
+                self.diagram_data[pid].append('--') # Em espera
+            elif self.process_map[pid].status == 'blocked':
+                self.diagram_data[pid].append('IO') # Bloqueado em E/S
+            else:
+                self.diagram_data[pid].append('  ') # Não chegou / Terminou
+
+    def run_tick(self, process):
+        """
+        Executa 1 unidade de CPU do processo. Retorna True se ele deixou
+        a CPU ao fim da unidade (terminou ou bloqueou para E/S).
+        """
+        if self.trace is not None:
+            self._trace_dispatch(process)
+        process.remaining_time -= 1
+        process.burst_remaining -= 1
+        self.cpu_done += 1
+        if process.burst_remaining > 0:
+            return False
+
+        end_time = self.current_time + 1
+        if process.remaining_time == 0:
+            process.status = 'completed'
+            process.completion_time = end_time
+            process.turnaround_time = process.completion_time - process.creation_time  #
+            # Tempo em E/S não é espera pela CPU
+            process.waiting_time = process.turnaround_time - process.duration - process.io_time  #
+            self.completed.append(process)
+            if self.trace is not None:
+                self._trace_leave(COMPLETE, process, end_time)
+        else:
+            # Fim da rajada de CPU: bloqueia até o fim da rajada de E/S
+            io_length = process.bursts[process.burst_index + 1]
+            process.burst_index += 2
+            process.burst_remaining = process.bursts[process.burst_index]
+            process.status = 'blocked'
+            process.wake_time = end_time + io_length
+            heapq.heappush(self.io_events, (process.wake_time, process.id, process))
+            if self.trace is not None:
+                self._trace_leave(BLOCK, process, end_time)
+        return True
+
+    def _trace_dispatch(self, process):
+        """Grava a troca de ocupante da CPU (o anterior foi preemptado)."""
+        if self._occupant is not process:
+            if self._occupant is not None:
+                self.trace.append((self._occupant_end, PREEMPT, self._occupant.id))
+            self.trace.append((self.current_time, DISPATCH, process.id))
+            self._occupant = process
+        self._occupant_end = self.current_time + 1
+
+    def _trace_leave(self, kind, process, end_time):
+        self.trace.append((end_time, kind, process.id))
+        self._occupant = None
+
+    def advance(self):
+        """Avança o relógio em 1 unidade de tempo."""
+        self.current_time += 1
+        if self.monitor is not None and self.current_time >= self._next_report:
+            self._report()
+
+    def _report(self):
+        """Chama o monitor (progresso/cancelamento cooperativo)."""
+        self._next_report = self.current_time + self.report_interval
+        self.monitor(self)
+
 
 # --- Padrão Strategy: Interface e Classes Base ---
 
@@ -75,9 +287,10 @@ class SchedulingStrategy(ABC):
     Interface (Strategy) para todos os algoritmos de escalonamento.
     """
     @abstractmethod
-    def schedule(self, processes, config):
+    def schedule(self, processes, config, run=None):
         """
         Executa a simulação de escalonamento.
+        'run' (opcional) é um SimulationRun que guarda os resultados extras.
         Retorna: (avg_tt, avg_wt, context_switches, diagram_str)
         """
         pass
@@ -100,7 +313,7 @@ class SchedulingStrategy(ABC):
         max_time = 0
         if diagram_data and pids[0] in diagram_data and diagram_data[pids[0]]:
             max_time = len(diagram_data[pids[0]])
-        
+
         for pid in pids:
             if pid not in diagram_data: diagram_data[pid] = []
             if len(diagram_data[pid]) < max_time:
@@ -122,6 +335,23 @@ class SchedulingStrategy(ABC):
             lines.append(" | ".join(row))
         return "\n".join(lines)
 
+    def _start_run(self, processes, run):
+        """Cria (se preciso) e inicializa o SimulationRun desta execução."""
+        if run is None:
+            run = SimulationRun()
+        run.start(processes)
+        return run
+
+    def _finish(self, run, context_switches):
+        """Fecha a execução e monta a tupla de resultados."""
+        run.makespan = run.current_time
+        avg_tt, avg_wt = self._calculate_stats(run.completed)
+        diagram_str = self._format_diagram(run.diagram_data, run.pids) if run.diagram and run.format else ''
+
+        # A primeira carga não é uma "troca"
+        final_switches = context_switches - 1 if context_switches > 0 else 0
+        return avg_tt, avg_wt, final_switches, diagram_str #
+
 class NonPreemptiveStrategy(SchedulingStrategy):
     """
     Classe base para algoritmos não-preemptivos (FCFS, SJF, PriorityNP).
@@ -132,97 +362,46 @@ class NonPreemptiveStrategy(SchedulingStrategy):
         """Hook (parte do padrão Template Method) para a lógica de seleção."""
         pass
 
-    def schedule(self, processes, config):
-        current_time = 0
+    def schedule(self, processes, config, run=None):
+        run = self._start_run(processes, run)
         context_switches = 0  #
         running_process = None
-        
-        pids = sorted([p.id for p in processes])
-        diagram_data = {pid: [] for pid in pids}
-        # (MODIFICADO) Mapa para consulta rápida do tempo de criação
-        process_map = {p.id: p for p in processes}
-        
-        # Fila de processos que ainda não chegaram
-        process_queue = sorted(processes, key=lambda p: (p.creation_time, p.id))
         ready_queue = []
-        completed = []
-
-        while len(completed) < len(processes):
-            # 1. Adiciona processos que chegam agora à fila de prontos
-            while process_queue and process_queue[0].creation_time <= current_time:
-                new_p = process_queue.pop(0)
-                new_p.status = 'ready'
-                ready_queue.append(new_p)
-                        
+
+        while len(run.completed) < len(processes):
+            # 1. Adiciona processos que chegam (ou voltam de E/S) à fila de prontos
+            run.admit(ready_queue.append)
+
             # 2. Se CPU está ociosa, seleciona um novo processo
             if running_process is None:
                 if ready_queue:
                     # A "estratégia" real é injetada aqui
                     running_process = self.select_next_process(ready_queue, None)
-                    
+
                     ready_queue.remove(running_process)
                     running_process.status = 'running'
                     if running_process.start_time == -1:
-                        running_process.start_time = current_time
+                        running_process.start_time = run.current_time
                     context_switches += 1
                 else:
                     # 3. CPU Ociosa e sem processos prontos
-                    if not process_queue:
+                    if not run.pending():
                         break  # Acabaram os processos
-                    
-                    # Salta o tempo para a próxima chegada
-                    next_arrival = process_queue[0].creation_time
-                    idle_ticks = next_arrival - current_time
-                    
-                    # (MODIFICADO) Grava ' ' para ociosidade ou 'não chegado'
-                    for t_idle in range(idle_ticks):
-                        t_now = current_time + t_idle
-                        for pid in pids:
-                            # CPU ociosa, ready_queue vazia. Ninguém é ## ou --.
-                            if t_now < process_map[pid].creation_time:
-                                diagram_data[pid].append('  ') # Não chegou
-                            else:
-                                diagram_data[pid].append('  ') # Terminou
-                    
-                    current_time = next_arrival
+
+                    # Salta o tempo para o próximo evento (chegada ou fim de E/S)
+                    run.skip_idle()
                     continue  # Reinicia o loop no novo tempo
 
             # 4. Simula 1 unidade de tempo
-            if running_process:
-                # (MODIFICADO) Lógica do diagrama para incluir espera
-                ready_pids = {p.id for p in ready_queue}
-                
-                for pid in pids:
-                    if pid == running_process.id:
-                        diagram_data[pid].append('##') # Em execução
-                    elif pid in ready_pids:
-                        diagram_data[pid].append('--') # Em espera
-                    else:
-                        # Não executando, não esperando.
-                        if current_time < process_map[pid].creation_time:
-                            diagram_data[pid].append('  ') # Não chegou
-                        else:
-                            diagram_data[pid].append('  ') # Terminou
-                
-                running_process.remaining_time -= 1
-
-                # 5. Verifica se o processo terminou
-                if running_process.remaining_time == 0:
-                    running_process.status = 'completed'
-                    running_process.completion_time = current_time + 1
-                    running_process.turnaround_time = running_process.completion_time - running_process.creation_time  #
-                    running_process.waiting_time = running_process.turnaround_time - running_process.duration  #
-                    completed.append(running_process)
-                    running_process = None
-            
-            current_time += 1
-        
-        avg_tt, avg_wt = self._calculate_stats(completed)
-        diagram_str = self._format_diagram(diagram_data, pids)
-        
-        # A primeira carga não é uma "troca"
-        final_switches = context_switches - 1 if context_switches > 0 else 0
-        return avg_tt, avg_wt, final_switches, diagram_str #
+            run.record_tick(running_process, ready_queue)
+
+            # 5. Verifica se o processo terminou ou bloqueou para E/S
+            if run.run_tick(running_process):
+                running_process = None
+
+            run.advance()
+
+        return self._finish(run, context_switches)
 
 class PreemptiveStrategy(SchedulingStrategy):
     """
@@ -234,110 +413,64 @@ class PreemptiveStrategy(SchedulingStrategy):
         """Hook para a lógica de seleção (inclui desempate)."""
         pass
 
-    def schedule(self, processes, config):
-        current_time = 0
+    def schedule(self, processes, config, run=None):
+        run = self._start_run(processes, run)
         context_switches = 0  #
         running_process = None
         last_running_process = None
-        
-        pids = sorted([p.id for p in processes])
-        diagram_data = {pid: [] for pid in pids}
-        # (MODIFICADO) Mapa para consulta rápida do tempo de criação
-        process_map = {p.id: p for p in processes}
-        
-        process_queue = sorted(processes, key=lambda p: (p.creation_time, p.id))
         ready_queue = []
-        completed = []
-        
-        while len(completed) < len(processes):
-            # 1. Adiciona processos que chegam agora
-            while process_queue and process_queue[0].creation_time <= current_time:
-                new_p = process_queue.pop(0)
-                new_p.status = 'ready'
-                ready_queue.append(new_p)
-                        
+
+        while len(run.completed) < len(processes):
+            # 1. Adiciona processos que chegam (ou voltam de E/S)
+            run.admit(ready_queue.append)
+
             # 2. Seleção preemptiva: candidatos = prontos + em execução
             candidates = list(ready_queue)
             if running_process:
                 candidates.append(running_process)
-                
+
             if not candidates:
                 # 3. CPU Ociosa
-                if not process_queue:
+                if not run.pending():
                     break  # Acabou
-                
-                # Salta o tempo para a próxima chegada
-                next_arrival = process_queue[0].creation_time
-                idle_ticks = next_arrival - current_time
-                
-                # (MODIFICADO) Grava ' ' para ociosidade ou 'não chegado'
-                for t_idle in range(idle_ticks):
-                    t_now = current_time + t_idle
-                    for pid in pids:
-                        if t_now < process_map[pid].creation_time:
-                            diagram_data[pid].append('  ') # Não chegou
-                        else:
-                            diagram_data[pid].append('  ') # Terminou
-                
-                current_time = next_arrival
+
+                # Salta o tempo para o próximo evento
+                run.skip_idle()
                 continue
 
             # 4. A "estratégia" real é injetada aqui
             next_process = self.select_next_process(candidates, running_process)
-            
+
             # 5. Lógica de troca de contexto
             if running_process != next_process:
                 if running_process:  # Processo anterior foi preemptado
                     running_process.status = 'ready'
                     if running_process not in ready_queue:
                         ready_queue.append(running_process)
-                
+
                 running_process = next_process
                 running_process.status = 'running'
                 if running_process in ready_queue:
                     ready_queue.remove(running_process)
-                
-                if last_running_process != running_process: 
+
+                if last_running_process != running_process:
                     context_switches += 1
                     last_running_process = running_process
 
             if running_process.start_time == -1:
-                running_process.start_time = current_time
+                running_process.start_time = run.current_time
 
             # 6. Simula 1 unidade de tempo
-            # (MODIFICADO) Lógica do diagrama para incluir espera
-            ready_pids = {p.id for p in ready_queue}
-
-            for pid in pids:
-                if pid == running_process.id:
-                    diagram_data[pid].append('##') # Em execução
-                elif pid in ready_pids:
-                    diagram_data[pid].append('--') # Em espera
-                else:
-                    if current_time < process_map[pid].creation_time:
-                        diagram_data[pid].append('  ') # Não chegou
-                    else:
-                        diagram_data[pid].append('  ') # Terminou
-            
-            running_process.remaining_time -= 1
-
-            # 7. Verifica se o processo terminou
-            if running_process.remaining_time == 0:
-                running_process.status = 'completed'
-                running_process.completion_time = current_time + 1
-                running_process.turnaround_time = running_process.completion_time - running_process.creation_time  #
-                running_process.waiting_time = running_process.turnaround_time - running_process.duration  #
-                completed.append(running_process)
+            run.record_tick(running_process, ready_queue)
+
+            # 7. Verifica se o processo terminou ou bloqueou para E/S
+            if run.run_tick(running_process):
                 running_process = None
                 last_running_process = None
-                
-            current_time += 1
-        
-        avg_tt, avg_wt = self._calculate_stats(completed)
-        diagram_str = self._format_diagram(diagram_data, pids)
-        
-        final_switches = context_switches - 1 if context_switches > 0 else 0
-        return avg_tt, avg_wt, final_switches, diagram_str #
+
+            run.advance()
+
+        return self._finish(run, context_switches)
 
 
 # --- Estratégias Concretas ---
@@ -352,9 +485,9 @@ class FCFSStrategy(NonPreemptiveStrategy):  #
 
 class SJFStrategy(NonPreemptiveStrategy):  #
     def select_next_process(self, ready_queue, running_process):
-        # Seleciona pela menor duração total
-        min_duration = min(p.duration for p in ready_queue)
-        eligible = [p for p in ready_queue if p.duration == min_duration]
+        # Seleciona pela menor rajada de CPU (a duração, se não há E/S)
+        min_duration = min(p.burst_remaining for p in ready_queue)
+        eligible = [p for p in ready_queue if p.burst_remaining == min_duration]
         # Aplica regras de desempate
         return _tie_break(eligible, running_process)
 
@@ -368,9 +501,9 @@ class PriorityNPStrategy(NonPreemptiveStrategy):  #
 
 class SRTFStrategy(PreemptiveStrategy):  #
     def select_next_process(self, candidates, running_process):
-        # Seleciona pelo menor tempo *restante*
-        min_remaining = min(p.remaining_time for p in candidates)
-        eligible = [p for p in candidates if p.remaining_time == min_remaining]
+        # Seleciona pelo menor tempo *restante* da rajada de CPU atual
+        min_remaining = min(p.burst_remaining for p in candidates)
+        eligible = [p for p in candidates if p.burst_remaining == min_remaining]
         # Aplica regras de desempate
         return _tie_break(eligible, running_process)
 
@@ -384,104 +517,59 @@ class PriorityPStrategy(PreemptiveStrategy):  #
 
 class RoundRobinStrategy(SchedulingStrategy):  #
     """Implementa Round-Robin simples (sem prioridade), que é FIFO."""
-    def schedule(self, processes, config):
+    def schedule(self, processes, config, run=None):
         quantum = int(config.get('quantum', 2))  #
-        current_time = 0
+        run = self._start_run(processes, run)
         context_switches = 0  #
         running_process = None
         last_running_process = None
-        
-        pids = sorted([p.id for p in processes])
-        diagram_data = {pid: [] for pid in pids}
-        # (MODIFICADO) Mapa para consulta rápida do tempo de criação
-        process_map = {p.id: p for p in processes}
-        
-        process_queue = sorted(processes, key=lambda p: (p.creation_time, p.id))
+
         # Round-Robin usa uma fila (FIFO)
         ready_queue = deque()
-        completed = []
-
-        while len(completed) < len(processes):
-            # 1. Adiciona novos processos ao FIM da fila
-            while process_queue and process_queue[0].creation_time <= current_time:
-                new_p = process_queue.pop(0)
-                new_p.status = 'ready'
-                ready_queue.append(new_p)
-                        
+
+        while len(run.completed) < len(processes):
+            # 1. Adiciona novos processos (e os que voltam de E/S) ao FIM da fila
+            run.admit(ready_queue.append)
+
             # 2. Se CPU ociosa, pega o próximo da INÍCIO da fila
             if running_process is None:
                 if ready_queue:
                     running_process = ready_queue.popleft()  # FIFO
                     running_process.status = 'running'
                     running_process.quantum_slice = 0
-                    
+
                     if last_running_process != running_process:
                         context_switches += 1
                         last_running_process = running_process
                     if running_process.start_time == -1:
-                        running_process.start_time = current_time
+                        running_process.start_time = run.current_time
                 else:
                     # 3. CPU Ociosa
-                    if not process_queue:
+                    if not run.pending():
                         break  # Acabou
-                    
-                    next_arrival = process_queue[0].creation_time
-                    idle_ticks = next_arrival - current_time
-                    
-                    # (MODIFICADO) Grava ' ' para ociosidade ou 'não chegado'
-                    for t_idle in range(idle_ticks):
-                        t_now = current_time + t_idle
-                        for pid in pids:
-                            if t_now < process_map[pid].creation_time:
-                                diagram_data[pid].append('  ') # Não chegou
-                            else:
-                                diagram_data[pid].append('  ') # Terminou
-                    
-                    current_time = next_arrival
+
+                    run.skip_idle()
                     continue
 
             # 4. Simula 1 unidade de tempo
-            # (MODIFICADO) Lógica do diagrama para incluir espera
-            ready_pids = {p.id for p in ready_queue}
-
-            for pid in pids:
-                if pid == running_process.id:
-                    diagram_data[pid].append('##') # Em execução
-                elif pid in ready_pids:
-                    diagram_data[pid].append('--') # Em espera
-                else:
-                    if current_time < process_map[pid].creation_time:
-                        diagram_data[pid].append('  ') # Não chegou
-                    else:
-                        diagram_data[pid].append('  ') # Terminou
-            
-            running_process.remaining_time -= 1
+            run.record_tick(running_process, ready_queue)
             running_process.quantum_slice += 1
 
-            # 5. Verifica se terminou
-            if running_process.remaining_time == 0:
-                running_process.status = 'completed'
-                running_process.completion_time = current_time + 1
-                running_process.turnaround_time = running_process.completion_time - running_process.creation_time  #
-                running_process.waiting_time = running_process.turnaround_time - running_process.duration  #
-                completed.append(running_process)
+            # 5. Verifica se terminou ou bloqueou para E/S
+            if run.run_tick(running_process):
                 running_process = None
                 last_running_process = None
-            
+
             # 6. Verifica se o quantum estourou
             elif running_process.quantum_slice == quantum:
                 running_process.status = 'ready'
                 ready_queue.append(running_process)  # Volta para o FIM da fila
                 running_process = None
                 last_running_process = None
-            
-            current_time += 1
-        
-        avg_tt, avg_wt = self._calculate_stats(completed)
-        diagram_str = self._format_diagram(diagram_data, pids)
-        
-        final_switches = context_switches - 1 if context_switches > 0 else 0
-        return avg_tt, avg_wt, final_switches, diagram_str #
+
+            run.advance()
+
+        return self._finish(run, context_switches)
 
 class RoundRobinPriorityAgingStrategy(SchedulingStrategy):  #
     """
@@ -489,32 +577,22 @@ class RoundRobinPriorityAgingStrategy(SchedulingStrategy):  #
     - Não há preempção por prioridade.
     - Envelhecimento ocorre a cada quantum.
     """
-    def schedule(self, processes, config):
+    def schedule(self, processes, config, run=None):
         quantum = int(config.get('quantum', 2))  #
         aging_rate = int(config.get('aging', 1))  #
-        
-        current_time = 0
+
+        run = self._start_run(processes, run)
         context_switches = 0  #
         running_process = None
         last_running_process = None
-        
-        pids = sorted([p.id for p in processes])
-        diagram_data = {pid: [] for pid in pids}
-        # (MODIFICADO) Mapa para consulta rápida do tempo de criação
-        process_map = {p.id: p for p in processes}
-        
-        process_queue = sorted(processes, key=lambda p: (p.creation_time, p.id))
+
         # A fila de prontos não é FIFO, é selecionada por prioridade
         ready_queue = []
-        completed = []
-
-        while len(completed) < len(processes):
-            # 1. Adiciona novos processos
-            while process_queue and process_queue[0].creation_time <= current_time:
-                new_p = process_queue.pop(0)
-                new_p.status = 'ready'
-                ready_queue.append(new_p)
-                        
+
+        while len(run.completed) < len(processes):
+            # 1. Adiciona novos processos (e os que voltam de E/S)
+            run.admit(ready_queue.append)
+
             # 2. Seleção (somente se CPU ociosa)
             # "não há preempção por prioridade"
             if running_process is None:
@@ -524,64 +602,33 @@ class RoundRobinPriorityAgingStrategy(SchedulingStrategy):  #
                     eligible = [p for p in ready_queue if p.current_priority == min_priority]
                     # Aplica desempate
                     running_process = _tie_break(eligible, None)
-                    
+
                     ready_queue.remove(running_process)
                     running_process.status = 'running'
                     running_process.quantum_slice = 0
-                    
+
                     if last_running_process != running_process:
                         context_switches += 1
                         last_running_process = running_process
                     if running_process.start_time == -1:
-                        running_process.start_time = current_time
+                        running_process.start_time = run.current_time
                 else:
                     # 3. CPU Ociosa
-                    if not process_queue:
+                    if not run.pending():
                         break  # Acabou
-                    
-                    next_arrival = process_queue[0].creation_time
-                    idle_ticks = next_arrival - current_time
-                    
-                    # (MODIFICADO) Grava ' ' para ociosidade ou 'não chegado'
-                    for t_idle in range(idle_ticks):
-                        t_now = current_time + t_idle
-                        for pid in pids:
-                            if t_now < process_map[pid].creation_time:
-                                diagram_data[pid].append('  ') # Não chegou
-                            else:
-                                diagram_data[pid].append('  ') # Terminou
-                    
-                    current_time = next_arrival
+
+                    run.skip_idle()
                     continue
 
             # 4. Simula 1 unidade de tempo
-            # (MODIFICADO) Lógica do diagrama para incluir espera
-            ready_pids = {p.id for p in ready_queue}
-
-            for pid in pids:
-                if pid == running_process.id:
-                    diagram_data[pid].append('##') # Em execução
-                elif pid in ready_pids:
-                    diagram_data[pid].append('--') # Em espera
-                else:
-                    if current_time < process_map[pid].creation_time:
-                        diagram_data[pid].append('  ') # Não chegou
-                    else:
-                        diagram_data[pid].append('  ') # Terminou
-            
-            running_process.remaining_time -= 1
+            run.record_tick(running_process, ready_queue)
             running_process.quantum_slice += 1
 
-            # 5. Verifica se terminou
-            if running_process.remaining_time == 0:
-                running_process.status = 'completed'
-                running_process.completion_time = current_time + 1
-                running_process.turnaround_time = running_process.completion_time - running_process.creation_time  #
-                running_process.waiting_time = running_process.turnaround_time - running_process.duration  #
-                completed.append(running_process)
+            # 5. Verifica se terminou ou bloqueou para E/S
+            if run.run_tick(running_process):
                 running_process = None
                 last_running_process = None
-            
+
             # 6. Verifica se o quantum estourou
             elif running_process.quantum_slice == quantum:
                 running_process.status = 'ready'
@@ -593,15 +640,201 @@ class RoundRobinPriorityAgingStrategy(SchedulingStrategy):  #
                 # Aplica a todos na fila de prontos
                 for p in ready_queue:
                     # Diminui o número da prioridade (aumenta a prioridade)
-                    p.current_priority = max(0, p.current_priority - aging_rate)
-            
-            current_time += 1
-        
-        avg_tt, avg_wt = self._calculate_stats(completed)
-        diagram_str = self._format_diagram(diagram_data, pids)
-        
-        final_switches = context_switches - 1 if context_switches > 0 else 0
-        return avg_tt, avg_wt, final_switches, diagram_str #
+                    aged = max(0, p.current_priority - aging_rate)
+                    if run.trace is not None and aged != p.current_priority:
+                        run.trace.append((run.current_time + 1, AGING, p.id, aged))
+                    p.current_priority = aged
+
+            run.advance()
+
+        return self._finish(run, context_switches)
+
+class _FenwickTree:
+    """
+    Árvore de Fenwick (somas parciais) sobre os bilhetes de cada posição.
+    Permite atualizar e sortear um bilhete em O(log n).
+    """
+    def __init__(self, size):
+        self.size = size
+        self.tree = [0] * (size + 1)
+        self.total = 0
+
+    def add(self, index, delta):
+        """Soma 'delta' aos bilhetes da posição 'index' (base 0)."""
+        self.total += delta
+        i = index + 1
+        while i <= self.size:
+            self.tree[i] += delta
+            i += i & -i
+
+    def find(self, target):
+        """Retorna a menor posição cuja soma acumulada ultrapassa 'target'."""
+        pos = 0
+        bit = 1 << (self.size.bit_length() - 1) if self.size else 0
+        while bit:
+            nxt = pos + bit
+            if nxt <= self.size and self.tree[nxt] <= target:
+                pos = nxt
+                target -= self.tree[nxt]
+            bit >>= 1
+        return pos
+
+class _StridePool:
+    """Fila de prontos do Stride: heap ordenado pelo valor de passo (pass)."""
+    def __init__(self, processes, config):
+        self.heap = []
+        self.passes = {p.id: 0 for p in processes}
+        self.strides = {p.id: STRIDE1 // _tickets_for(p) for p in processes}
+        self.global_pass = 0
+
+    def add(self, process):
+        # Quem chega não pode ficar atrás do passo global, senão
+        # monopolizaria a CPU até "alcançar" os demais.
+        pass_value = max(self.passes[process.id], self.global_pass)
+        self.passes[process.id] = pass_value
+        heapq.heappush(self.heap, (pass_value, process.id, process))
+
+    def pop(self):
+        pass_value, _, process = heapq.heappop(self.heap)
+        self.global_pass = pass_value
+        return process
+
+    def charge(self, process, ticks_used):
+        self.passes[process.id] += self.strides[process.id] * ticks_used
+
+class _LotteryPool:
+    """Fila de prontos do Lottery: sorteio de bilhetes via árvore de Fenwick."""
+    def __init__(self, processes, config):
+        ordered = sorted(processes, key=lambda p: p.id)
+        self.slots = {p.id: i for i, p in enumerate(ordered)}
+        self.by_slot = ordered
+        self.tickets = {p.id: _tickets_for(p) for p in processes}
+        self.tree = _FenwickTree(len(ordered))
+        # Semente fixa por padrão para a simulação ser reprodutível
+        self.rng = random.Random(int(config.get('seed', 0)))
+
+    def add(self, process):
+        self.tree.add(self.slots[process.id], self.tickets[process.id])
+
+    def pop(self):
+        winner = self.by_slot[self.tree.find(self.rng.randrange(self.tree.total))]
+        self.tree.add(self.slots[winner.id], -self.tickets[winner.id])
+        return winner
+
+    def charge(self, process, ticks_used):
+        pass  # No sorteio não há contabilidade entre quanta
+
+class ProportionalShareStrategy(SchedulingStrategy):
+    """
+    Classe base para escalonamento por fração proporcional (Stride, Lottery).
+    - A cada quantum escolhe-se um processo conforme seus bilhetes.
+    - Novas chegadas não causam preempção dentro do quantum.
+    """
+    @abstractmethod
+    def _make_pool(self, processes, config):
+        """Cria a fila de prontos (add/pop/charge) usada na seleção."""
+        pass
+
+    def schedule(self, processes, config, run=None):
+        quantum = int(config.get('quantum', 2))  #
+        run = self._start_run(processes, run)
+        context_switches = 0  #
+        running_process = None
+        last_running_process = None
+
+        pool = self._make_pool(processes, config)
+        ready = {}  # id -> processo na fila de prontos
+
+        def make_ready(process):
+            pool.add(process)
+            ready[process.id] = process
+
+        while len(run.completed) < len(processes):
+            # 1. Adiciona novos processos (e os que voltam de E/S) à fila de prontos
+            run.admit(make_ready)
+
+            # 2. Se CPU ociosa, seleciona pelo critério proporcional
+            if running_process is None:
+                if ready:
+                    running_process = pool.pop()
+                    del ready[running_process.id]
+                    running_process.status = 'running'
+                    running_process.quantum_slice = 0
+
+                    if last_running_process != running_process:
+                        context_switches += 1
+                        last_running_process = running_process
+                    if running_process.start_time == -1:
+                        running_process.start_time = run.current_time
+                else:
+                    # 3. CPU Ociosa
+                    if not run.pending():
+                        break  # Acabou
+
+                    run.skip_idle()
+                    continue
+
+            # 4. Simula 1 unidade de tempo
+            run.record_tick(running_process, ready.values())
+            running_process.quantum_slice += 1
+
+            # 5. Verifica se terminou ou bloqueou para E/S
+            if run.run_tick(running_process):
+                pool.charge(running_process, running_process.quantum_slice)
+                running_process = None
+                last_running_process = None
+
+            # 6. Verifica se o quantum estourou
+            elif running_process.quantum_slice == quantum:
+                pool.charge(running_process, running_process.quantum_slice)
+                running_process.status = 'ready'
+                make_ready(running_process)
+                running_process = None
+                # Como no RR: ganhar o quantum de novo também conta como troca
+                last_running_process = None
+
+            run.advance()
+
+        return self._finish(run, context_switches)
+
+class StrideStrategy(ProportionalShareStrategy):
+    """Stride: executa o processo com menor passo acumulado (heap)."""
+    def _make_pool(self, processes, config):
+        return _StridePool(processes, config)
+
+class LotteryStrategy(ProportionalShareStrategy):
+    """Lottery: sorteia um bilhete (semente em config['seed'])."""
+    def _make_pool(self, processes, config):
+        return _LotteryPool(processes, config)
+
+
+# --- Estratégias embutidas e seus metadados (usados também pela API) ---
+# Novas estratégias podem vir de plugins (ver strategy_registry).
+
+BUILTIN_STRATEGIES = [
+    StrategySpec("FCFS", FCFSStrategy, "First-Come First-Served",
+                 "Processos são executados na ordem de chegada"),
+    StrategySpec("SJF", SJFStrategy, "Shortest Job First",
+                 "Processo com menor duração executa primeiro"),
+    StrategySpec("SRTF", SRTFStrategy, "Shortest Remaining Time First",
+                 "Versão preemptiva do SJF", preemptive=True),
+    StrategySpec("PriorityNP", PriorityNPStrategy, "Priority (Non-Preemptive)",
+                 "Executa por prioridade sem preempção"),
+    StrategySpec("PriorityP", PriorityPStrategy, "Priority (Preemptive)",
+                 "Executa por prioridade com preempção", preemptive=True),
+    StrategySpec("RoundRobin", RoundRobinStrategy, "Round Robin",
+                 "Execução em fatias de tempo (quantum)", preemptive=True, needs_quantum=True),
+    StrategySpec("RoundRobinPriorityAging", RoundRobinPriorityAgingStrategy,
+                 "Round Robin com Prioridade e Envelhecimento",
+                 "RR com prioridade e aumento de prioridade ao longo do tempo",
+                 preemptive=True, needs_quantum=True, needs_aging=True),
+    StrategySpec("Stride", StrideStrategy, "Stride Scheduling",
+                 "Fração proporcional: executa o menor passo acumulado (bilhetes)",
+                 preemptive=True, needs_quantum=True),
+    StrategySpec("Lottery", LotteryStrategy, "Lottery Scheduling",
+                 "Fração proporcional: sorteio de bilhetes a cada quantum",
+                 preemptive=True, needs_quantum=True),
+]
 
 
 # --- Classe "Contexto" do Padrão Strategy ---
@@ -614,16 +847,8 @@ class SchedulerSimulator:
     def __init__(self):
         self.processes = []
         self.config = {}
-        # Dicionário de estratégias disponíveis
-        self.strategies = {
-            "FCFS": FCFSStrategy(),  #
-            "SJF": SJFStrategy(),  #
-            "SRTF": SRTFStrategy(),  #
-            "PriorityNP": PriorityNPStrategy(),  #
-            "PriorityP": PriorityPStrategy(),  #
-            "RoundRobin": RoundRobinStrategy(),  #
-            "RoundRobinPriorityAging": RoundRobinPriorityAgingStrategy()  #
-        }
+        # Estratégias disponíveis (id -> instância, criada no primeiro uso)
+        self.strategies = StrategyRegistry(BUILTIN_STRATEGIES)
         self.current_strategy = None
 
     def set_strategy(self, name):
@@ -658,29 +883,38 @@ class SchedulerSimulator:
     def load_processes_from_stdin(self):
         """Lê os dados dos processos da entrada padrão (stdin)."""
         print("Digite os processos (instante, duração, prioridade), um por linha.", file=sys.stderr)
+        print("Para E/S, continue a linha com rajadas alternadas: instante cpu prioridade es cpu [es cpu ...]", file=sys.stderr)
         print("Pressione Ctrl+D (Linux/Mac) ou Ctrl+Z+Enter (Windows) para finalizar.", file=sys.stderr)
         pid_counter = 1
         try:
             for line in sys.stdin:  #
                 parts = line.strip().split()  #
-                if len(parts) == 3:
+                if len(parts) >= 3 and len(parts) % 2 == 1:
                     try:
-                        t_creation, duration, priority = map(int, parts)  #
-                        if duration <= 0:
+                        t_creation, duration, priority, *io_cpu = map(int, parts)  #
+                        if duration <= 0 or any(b <= 0 for b in io_cpu):
                              print(f"Ignorando processo com duração inválida (<= 0): {line.strip()}", file=sys.stderr)
                              continue
-                        self.processes.append(Process(f"P{pid_counter}", t_creation, duration, priority))
+                        bursts = [duration] + io_cpu if io_cpu else None
+                        self.processes.append(Process(f"P{pid_counter}", t_creation, duration, priority, bursts=bursts))
                         pid_counter += 1
                     except ValueError:
                          print(f"Ignorando linha mal formatada (não são inteiros): {line.strip()}", file=sys.stderr)
                 elif parts:
-                    print(f"Ignorando linha mal formatada (esperava 3 valores): {line.strip()}", file=sys.stderr)
+                    print(f"Ignorando linha mal formatada (esperava 3 valores, ou rajadas CPU/E-S após a prioridade): {line.strip()}", file=sys.stderr)
         except EOFError:
             pass
         print(f"Leitura finalizada. {len(self.processes)} processos carregados.", file=sys.stderr)
 
-    def run_all(self):
-        """Executa a simulação para todas as estratégias implementadas."""
+    def run_all(self, names=None):
+        """
+        Executa a simulação para as estratégias pedidas (padrão: todas,
+        incluindo as de plugins). Só as estratégias usadas são carregadas.
+        """
+        unknown = [name for name in names or [] if name not in self.strategies]
+        if unknown:
+            print(f"Estratégia(s) desconhecida(s): {', '.join(unknown)}. Disponíveis: {', '.join(self.strategies)}", file=sys.stderr)
+            return
         self.load_config("config.txt")
         self.load_processes_from_stdin()
         
@@ -692,20 +926,21 @@ class SchedulerSimulator:
         print("Iniciando Simulação de Escalonamento")
         print("="*40)
 
-        for name, strategy in self.strategies.items():
+        for name in names or list(self.strategies):
             print(f"\n--- Executando Algoritmo: {name} ---")
-            self.current_strategy = strategy
-            
             # Cria cópias limpas dos processos para cada simulação
             processes_copy = [p.clone() for p in self.processes]
             
             try:
-                avg_tt, avg_wt, context_switches, diagram_str = self.current_strategy.schedule(processes_copy, self.config)
+                self.set_strategy(name)  # Importa a estratégia (plugin) só agora
+                run = SimulationRun()
+                avg_tt, avg_wt, context_switches, diagram_str = self.current_strategy.schedule(processes_copy, self.config, run)
                 
                 # Imprime os resultados na saída padrão (stdout)
                 print(f"Tempo médio de vida (tt): {avg_tt:.2f}")  #
                 print(f"Tempo médio de espera (tw): {avg_wt:.2f}")  #
                 print(f"Número de trocas de contexto: {context_switches}")  #
+                print(f"Tempo de CPU ociosa: {run.cpu_idle_time} (utilização: {run.cpu_utilization:.2%})")
                 print("Diagrama de tempo:")  #
                 print(diagram_str)
             
@@ -717,5 +952,6 @@ class SchedulerSimulator:
 
 # --- Ponto de Entrada do Programa ---
 if __name__ == "__main__":
+    # Uso: python SchedulerNoGUI.py [ESTRATÉGIA ...] < processos.txt
     simulator = SchedulerSimulator()
-    simulator.run_all()
\ No newline at end of file
+    simulator.run_all(sys.argv[1:] or None)
\ No newline at end of file
@@ -1,15 +1,23 @@
 #!/usr/bin/env python3
 
-from flask import Flask, request, jsonify
+from flask import Flask, Response, request, jsonify, g
 from flask_cors import CORS
 import json
 import sys
 import os
+import time
 
 # Adiciona o diretório atual ao path para importar o SchedulerNoGUI
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
-from SchedulerNoGUI import SchedulerSimulator, Process
+from SchedulerNoGUI import SchedulerSimulator, SimulationRun, Process
+from workload_store import WorkloadStore, WorkloadNotFound, WorkloadTooLarge
+from timeline import TimelineIndex, ResultStore, DEFAULT_MAX_POINTS
+from jobs import JobManager, COMPLETED, FAILED, CANCELLED
+import cost_model
+import telemetry
+import tuning
+import wire_format
 
 app = Flask(__name__)
 CORS(app)  # Permite requisições do frontend React
@@ -17,59 +25,642 @@ CORS(app)  # Permite requisições do frontend React
 # Instância global do simulador
 simulator = SchedulerSimulator()
 
+# Cargas enviadas uma vez e referenciadas por handle (compartilhadas entre workers)
+workload_store = WorkloadStore()
+
+# Índices de linha do tempo dos resultados recentes (consultas por janela)
+result_store = ResultStore()
+
+def _result_bytes(result):
+    """
+    Memória estimada de um resultado guardado: o texto do diagrama mais
+    uma referência (8 bytes) por célula de diagramData.
+    """
+    diagram = result.get('diagramData') or {}
+    cells = sum(len(p.get('timeline', ())) for p in diagram.get('processes', ()))
+    return 1024 + len(result.get('rawDiagram') or '') + 8 * cells
+
+# Simulações longas executadas em segundo plano (pool criado sob demanda);
+# os resultados guardados são limitados também em memória
+job_manager = JobManager(sizeof=_result_bytes)
+
+# Orçamentos de tempo/memória por requisição (ver cost_model)
+admission = cost_model.AdmissionPolicy()
+
+# Métricas expostas em /api/metrics (formato texto do Prometheus)
+registry = telemetry.Registry()
+REQUESTS = registry.counter('scheduler_requests_total', 'Requisições HTTP atendidas.',
+                            ('endpoint', 'algorithm', 'status'))
+LATENCY = registry.histogram('scheduler_request_duration_seconds', 'Latência das requisições HTTP.',
+                             ('endpoint', 'algorithm'))
+SIMULATIONS = registry.counter('scheduler_simulations_total', 'Simulações executadas.',
+                               ('algorithm', 'source'))
+TICKS = registry.counter('scheduler_simulated_ticks_total', 'Unidades de tempo simuladas.',
+                         ('algorithm', 'source'))
+SIMULATION_SECONDS = registry.counter('scheduler_simulation_seconds_total',
+                                      'Tempo gasto simulando no processo da API (segundos).', ('algorithm', 'source'))
+TICK_RATE = registry.gauge('scheduler_ticks_per_second',
+                           'Unidades de tempo simuladas por segundo na última simulação no processo da API.', ('algorithm',))
+WORKLOAD_PROCESSES = registry.histogram('scheduler_workload_processes', 'Processos por carga admitida.',
+                                        buckets=(1, 10, 100, 1000, 10000, 100000, 1000000))
+WORKLOAD_BURST = registry.histogram('scheduler_workload_total_burst', 'Tempo total de CPU por carga admitida.',
+                                    buckets=(10, 100, 1000, 10000, 100000, 1000000, 10000000, 100000000))
+ADMISSIONS = registry.counter('scheduler_admission_decisions_total', 'Decisões do controle de admissão.',
+                              ('decision',))
+RESULT_LOOKUPS = registry.counter('scheduler_result_lookups_total',
+                                  'Consultas ao cache de resultados (hit/miss).', ('result',))
+registry.gauge('scheduler_results_cached', 'Índices de linha do tempo em cache.',
+               collect=lambda: len(result_store))
+registry.gauge('scheduler_results_capacity', 'Capacidade do cache de resultados.',
+               collect=lambda: result_store.capacity)
+registry.gauge('scheduler_jobs', 'Jobs por estado.', ('status',),
+               collect=lambda: {(status,): count for status, count in job_manager.stats().items()})
+registry.gauge('scheduler_workloads_stored', 'Cargas no armazenamento.',
+               collect=lambda: workload_store.stats()['workloads'])
+registry.gauge('scheduler_workload_store_bytes', 'Bytes ocupados pelas cargas armazenadas.',
+               collect=lambda: workload_store.stats()['bytes'])
+telemetry.process_metrics(registry)
+
+@app.before_request
+def _start_timer():
+    g.request_start = time.perf_counter()
+
+@app.after_request
+def _record_request(response):
+    """Conta a requisição e sua latência, por endpoint e estratégia."""
+    start = g.pop('request_start', None)
+    if start is not None:
+        body = request.get_json(silent=True) if request.is_json else None
+        algorithm = body.get('algorithm') if isinstance(body, dict) else None
+        # Só nomes conhecidos viram rótulo (evita cardinalidade ilimitada)
+        algorithm = algorithm if isinstance(algorithm, str) and algorithm in simulator.strategies else ''
+        endpoint = request.endpoint or 'unknown'
+        REQUESTS.inc(endpoint=endpoint, algorithm=algorithm, status=response.status_code)
+        LATENCY.observe(time.perf_counter() - start, endpoint=endpoint, algorithm=algorithm)
+    return response
+
+def _observe_simulation(algorithm, source, ticks, seconds=None, count=1):
+    SIMULATIONS.inc(count, algorithm=algorithm, source=source)
+    TICKS.inc(ticks, algorithm=algorithm, source=source)
+    if seconds is not None:
+        SIMULATION_SECONDS.inc(seconds, algorithm=algorithm, source=source)
+        if seconds > 0:
+            TICK_RATE.set(ticks / seconds, algorithm=algorithm)
+
 @app.route('/api/simulate', methods=['POST'])
 def simulate():
     try:
         data = request.get_json()
         
-        # Extrai dados da requisição
-        processes_data = data.get('processes', [])
-        algorithm = data.get('algorithm', 'FCFS')
-        config = data.get('config', {'quantum': 2, 'aging': 1})
-        
         # Validação básica
-        if not processes_data:
+        if not data.get('processes') and not data.get('workload'):
             return jsonify({'error': 'Nenhum processo fornecido'}), 400
         
-        # Converte dados dos processos para objetos Process
-        processes = []
-        for i, proc_data in enumerate(processes_data):
-            process = Process(
-                id=f"P{i+1}",
-                creation_time=int(proc_data.get('creationTime', 0)),
-                duration=int(proc_data.get('duration', 1)),
-                priority=int(proc_data.get('priority', 1))
-            )
-            processes.append(process)
+        # Formato da resposta (json padrão, compact ou msgpack)
+        fmt = _negotiate_format()
+        if fmt is None:
+            return _not_acceptable()
         
-        # Configura o simulador
-        simulator.processes = processes
-        simulator.config = config
-        simulator.set_strategy(algorithm)
+        include_diagram = data.get('includeDiagram', True)
+        if fmt != wire_format.JSON:
+            # O diagrama vai em trechos (RLE), montados a partir do índice
+            data = {**data, 'includeDiagram': False}
         
-        # Executa a simulação
-        processes_copy = [p.clone() for p in processes]
-        avg_tt, avg_wt, context_switches, diagram_str = simulator.current_strategy.schedule(processes_copy, config)
+        # Controle de admissão: estima o custo antes de executar. Sem pedido
+        # de resposta assíncrona, executa na hora até o orçamento de jobs
+        processes = resolve_processes(data.get('workload') or data.get('processes'))
+        decision, data, info = _admit(data, processes, allow_queue=_wants_async(data))
+        if decision == cost_model.REJECT:
+            return _rejected(info)
+        if decision == cost_model.QUEUE:
+            # O formato do resultado só é negociado na busca: indexa sempre
+            job = job_manager.submit(run_simulation, {**data, 'index': True}, on_done=_store_job_result)
+            return _accepted_job(job, info)
         
-        # Processa o diagrama para formato JSON
-        diagram_data = parse_diagram(diagram_str, processes)
+        start = time.perf_counter()
+        result, index = run_simulation(data, processes=processes)
+        _observe_simulation(result['algorithm'], 'sync', result['makespan'], time.perf_counter() - start)
+        if decision == cost_model.DOWNGRADE:
+            result['admission'] = info
+        if index is not None:
+            if fmt != wire_format.JSON and include_diagram:
+                result['diagramRuns'] = index.runs()
+            # Indexa a linha do tempo para consultas por janela (/timeline)
+            result['resultId'] = result_store.put(index)
         
-        # Retorna os resultados
-        result = {
-            'success': True,
-            'algorithm': algorithm,
-            'avgTurnaroundTime': avg_tt,
-            'avgWaitingTime': avg_wt,
-            'contextSwitches': context_switches,
-            'diagramData': diagram_data,
-            'rawDiagram': diagram_str
-        }
+        return encode_response(result, fmt)
         
+    except WorkloadNotFound as e:
+        return jsonify({'error': f"Carga '{e}' não encontrada ou expirada"}), 404
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+def run_simulation(data, monitor=None, processes=None):
+    """
+    Executa a simulação descrita no corpo de /api/simulate.
+    Retorna (resultado em JSON, TimelineIndex ou None). O índice só é
+    montado quando o diagrama não vai na resposta (o cliente busca as
+    janelas em /timeline) ou com index=true; nunca em metricsOnly.
+    Usada também pelos jobs, no processo trabalhador, com 'monitor' para
+    progresso e cancelamento.
+    """
+    # Extrai dados da requisição
+    processes_data = data.get('processes', [])
+    algorithm = data.get('algorithm', 'FCFS')
+    config = data.get('config', {'quantum': 2, 'aging': 1})
+    
+    if algorithm not in simulator.strategies:
+        raise ValueError(f"Estratégia '{algorithm}' desconhecida.")
+    
+    # Converte dados dos processos (ou a carga armazenada) para objetos Process
+    if processes is None:
+        processes = resolve_processes(data.get('workload') or processes_data)
+    
+    # Executa a simulação (metricsOnly: sem diagrama nem linha do tempo)
+    metrics_only = data.get('metricsOnly', False)
+    include_diagram = data.get('includeDiagram', True)
+    processes_copy = [p.clone() for p in processes]
+    # O texto do diagrama só é montado se vai na resposta
+    run = SimulationRun(diagram=not metrics_only, monitor=monitor, format=include_diagram)
+    avg_tt, avg_wt, context_switches, diagram_str = simulator.strategies[algorithm].schedule(processes_copy, config, run)
+    
+    result = {
+        'success': True,
+        'algorithm': algorithm,
+        'avgTurnaroundTime': avg_tt,
+        'avgWaitingTime': avg_wt,
+        'contextSwitches': context_switches,
+        'cpuIdleTime': run.cpu_idle_time,
+        'cpuUtilization': run.cpu_utilization,
+        'makespan': run.makespan
+    }
+    
+    if metrics_only:
+        return result, None
+    
+    # Com includeDiagram=false o cliente busca só as janelas que exibir
+    if include_diagram:
+        result['diagramData'] = parse_diagram(diagram_str, processes)
+        result['rawDiagram'] = diagram_str
+        if not data.get('index', False):
+            return result, None
+    
+    return result, TimelineIndex(run.diagram_data, run.pids)
+
+def _admit(data, processes, allow_queue=True):
+    """
+    Estima o custo da simulação e aplica a política de admissão.
+    Retorna (decisão, corpo ajustado ao modo de execução, informações).
+    """
+    if data.get('algorithm', 'FCFS') not in simulator.strategies:
+        raise ValueError(f"Estratégia '{data.get('algorithm')}' desconhecida.")
+    if data.get('metricsOnly'):
+        mode = cost_model.METRICS
+    elif data.get('includeDiagram', True):
+        mode = cost_model.FULL
+    else:
+        mode = cost_model.TIMELINE
+    cost = cost_model.estimate(processes, data.get('algorithm', 'FCFS'), data.get('config'))
+    decision, mode, reason = admission.decide(cost, mode, allow_queue)
+    ADMISSIONS.inc(decision=decision)
+    WORKLOAD_PROCESSES.observe(cost.process_count)
+    WORKLOAD_BURST.observe(cost.total_burst)
+    info = {'decision': decision, 'mode': mode, 'estimate': cost.to_dict(mode)}
+    if reason:
+        info['reason'] = reason
+    if mode == cost_model.METRICS:
+        data = {**data, 'includeDiagram': False, 'metricsOnly': True}
+    return decision, data, info
+
+def _rejected(info):
+    return jsonify({'error': info['reason'], 'admission': info, 'budget': admission.to_dict()}), 413
+
+def _wants_async(data):
+    """
+    O cliente aceita virar job (202)? Pedido com "async": true no corpo ou
+    com o cabeçalho Prefer: respond-async (RFC 7240).
+    """
+    if data.get('async') is True:
+        return True
+    prefer = request.headers.get('Prefer', '')
+    return any(part.split(';')[0].strip().lower() == 'respond-async' for part in prefer.split(','))
+
+def _accepted_job(job, info):
+    """Resposta 202 de uma requisição síncrona que virou job."""
+    response = jsonify({**job.to_dict(), 'admission': info})
+    response.headers['Location'] = f"/api/jobs/{job.id}"
+    if request.headers.get('Prefer'):
+        response.headers['Preference-Applied'] = 'respond-async'
+    return response, 202
+
+@app.route('/api/estimate', methods=['POST'])
+def estimate_cost():
+    """
+    Estima tempo e memória da simulação (mesmo corpo de /api/simulate) em
+    cada modo e informa a decisão de admissão, sem executar nada.
+    """
+    try:
+        data = request.get_json()
+        if not data.get('processes') and not data.get('workload'):
+            return jsonify({'error': 'Nenhum processo fornecido'}), 400
+        processes = resolve_processes(data.get('workload') or data.get('processes'))
+        _, _, info = _admit(data, processes, allow_queue=_wants_async(data))
+        cost = cost_model.estimate(processes, data.get('algorithm', 'FCFS'), data.get('config'))
+        return jsonify({
+            'admission': info,
+            'budget': admission.to_dict(),
+            'modes': {mode: cost.to_dict(mode) for mode in (cost_model.FULL, cost_model.TIMELINE, cost_model.METRICS)}
+        })
+    except WorkloadNotFound as e:
+        return jsonify({'error': f"Carga '{e}' não encontrada ou expirada"}), 404
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/api/optimize', methods=['POST'])
+def optimize_parameters():
+    """
+    Ajusta quantum/aging de uma estratégia para a carga (ver tuning). Corpo:
+    processes/workload, algorithm, objective (padrão p95_wt) e, opcionais,
+    maxContextSwitches, quanta, agings, eta e exhaustive. Com "async": true
+    ou Prefer: respond-async, buscas acima do limite síncrono viram job
+    (202); sem isso, recebem 413.
+    """
+    try:
+        data = request.get_json()
+        if not data.get('processes') and not data.get('workload'):
+            return jsonify({'error': 'Nenhum processo fornecido'}), 400
+        processes = resolve_processes(data.get('workload') or data.get('processes'))
+        try:
+            decision, info = _admit_optimization(data, processes, allow_queue=_wants_async(data))
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+        if decision == cost_model.REJECT:
+            return _rejected(info)
+        if decision == cost_model.QUEUE:
+            job = job_manager.submit(run_optimization, data, on_done=_store_optimization_result)
+            return _accepted_job(job, info)
+
+        start = time.perf_counter()
+        result = run_optimization(data, processes=processes)
+        _observe_simulation(result['algorithm'], 'optimize', result['simulatedTicks'],
+                            time.perf_counter() - start, count=result['evaluations'])
         return jsonify(result)
-        
+
+    except WorkloadNotFound as e:
+        return jsonify({'error': f"Carga '{e}' não encontrada ou expirada"}), 404
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+def _build_tuner(data, processes, monitor=None):
+    """Tuner e grade de parâmetros descritos no corpo de /api/optimize."""
+    max_switches = data.get('maxContextSwitches')
+    tuner = tuning.Tuner(data.get('algorithm', 'RoundRobin'), processes,
+                         objective=data.get('objective', tuning.DEFAULT_OBJECTIVE),
+                         max_switches=None if max_switches is None else int(max_switches),
+                         config=data.get('config'), simulator=simulator, monitor=monitor)
+    grid = tuning.build_grid(tuner.spec, processes, data.get('quanta'), data.get('agings'))
+    return tuner, grid
+
+def run_optimization(data, monitor=None, processes=None):
+    """
+    Executa a busca de /api/optimize. Usada também pelos jobs, no processo
+    trabalhador, com 'monitor' para progresso e cancelamento.
+    """
+    if processes is None:
+        processes = resolve_processes(data.get('workload') or data.get('processes'))
+    tuner, grid = _build_tuner(data, processes, monitor)
+    if data.get('exhaustive'):
+        return tuner.exhaustive(grid)
+    return tuner.successive_halving(grid, int(data.get('eta', tuning.DEFAULT_ETA)))
+
+def _admit_optimization(data, processes, allow_queue=True):
+    """
+    Estima a busca como 'runs' execuções completas só de métricas (pelo
+    plano do successive halving) e aplica a política de admissão.
+    """
+    tuner, grid = _build_tuner(data, processes)
+    n = len(processes)
+    if data.get('exhaustive'):
+        runs = len(grid)
+    else:
+        runs = tuning.planned_work(tuning.plan(len(grid), n, int(data.get('eta', tuning.DEFAULT_ETA))), n)
+    # O menor quantum da grade é o caso mais caro
+    quantum = min((q for q, _ in grid if q is not None), default=2)
+    cost = cost_model.estimate(processes, tuner.algorithm, {'quantum': quantum})
+    cost.runs = runs
+    decision, mode, reason = admission.decide(cost, cost_model.METRICS, allow_queue)
+    if decision == cost_model.REJECT and cost.seconds(mode) > admission.sync_seconds:
+        reason += ' (ou reduza a grade com quanta/agings)'
+    ADMISSIONS.inc(decision=decision)
+    info = {'decision': decision, 'mode': mode, 'estimate': cost.to_dict(mode)}
+    if reason:
+        info['reason'] = reason
+    return decision, info
+
+def _store_optimization_result(result):
+    """Contabiliza as simulações de uma busca concluída em job (no processo da API)."""
+    _observe_simulation(result['algorithm'], 'optimize', result['simulatedTicks'], count=result['evaluations'])
+    return result
+
+def _negotiate_format():
+    """Formato pedido via ?format= ou cabeçalho Accept (None = indisponível)."""
+    return wire_format.negotiate_format(request.headers.get('Accept'), request.args.get('format'))
+
+def _not_acceptable():
+    available = [f for f in wire_format.MIMETYPES if f != wire_format.MSGPACK or wire_format.msgpack]
+    return jsonify({'error': 'Formato de resposta indisponível', 'formats': available}), 406
+
+def encode_response(payload, fmt, status=200):
+    """Serializa no formato negociado e comprime conforme Accept-Encoding."""
+    body, mimetype = wire_format.serialize(payload, fmt)
+    body, encoding = wire_format.compress(body, request.headers.get('Accept-Encoding'))
+    response = Response(body, status=status, mimetype=mimetype)
+    if encoding:
+        response.headers['Content-Encoding'] = encoding
+    response.headers['Vary'] = 'Accept, Accept-Encoding'
+    return response
+
+def build_processes(processes_data):
+    """Converte a lista de processos do JSON em objetos Process."""
+    processes = []
+    for i, proc_data in enumerate(processes_data):
+        process = Process(
+            id=f"P{i+1}",
+            creation_time=int(proc_data.get('creationTime', 0)),
+            duration=int(proc_data.get('duration', 1)),
+            priority=int(proc_data.get('priority', 1)),
+            tickets=proc_data.get('tickets'),
+            # Rajadas alternadas CPU/E-S, ex: [3, 2, 4] (opcional)
+            bursts=proc_data.get('bursts')
+        )
+        processes.append(process)
+    return processes
+
+def resolve_processes(workload):
+    """Aceita a lista de processos do JSON ou o handle de uma carga armazenada."""
+    if isinstance(workload, str):
+        return workload_store.get(workload).to_processes()
+    return build_processes(workload)
+
+def _workload_tuples(workload):
+    """
+    (criação, duração, prioridade) por processo, para o motor vetorizado,
+    ou None se a carga tiver E/S ou bilhetes explícitos.
+    """
+    if isinstance(workload, str):
+        stored = workload_store.get(workload)
+        return stored.to_tuples() if stored.cpu_only else None
+    if any(p.get('bursts') or p.get('tickets') is not None for p in workload):
+        return None
+    return [(int(p.get('creationTime', 0)), int(p.get('duration', 1)), int(p.get('priority', 1)))
+            for p in workload]
+
+def _load_batch_engine():
+    """Importa o motor vetorizado sob demanda (requer NumPy)."""
+    try:
+        import batch_engine
+        return batch_engine
+    except ImportError:
+        return None
+
+@app.route('/api/simulate/batch', methods=['POST'])
+def simulate_batch():
+    """
+    Simula muitas cargas pequenas e independentes de uma vez e retorna
+    apenas as métricas de cada uma (sem diagrama).
+    """
+    try:
+        data = request.get_json()
+
+        workloads_data = data.get('workloads', [])
+        algorithm = data.get('algorithm', 'FCFS')
+        config = data.get('config', {'quantum': 2, 'aging': 1})
+
+        if not workloads_data or not all(workloads_data):
+            return jsonify({'error': 'Nenhuma carga fornecida (ou carga sem processos)'}), 400
+        if algorithm not in simulator.strategies:
+            return jsonify({'error': f"Estratégia '{algorithm}' desconhecida."}), 400
+
+        # O motor vetorizado cobre cargas CPU-bound sem bilhetes explícitos
+        engine = _load_batch_engine()
+        workloads = None
+        if engine is not None and algorithm in engine.SUPPORTED:
+            workloads = [_workload_tuples(workload) for workload in workloads_data]
+            if any(w is None for w in workloads):
+                workloads = None
+        vectorized = workloads is not None
+
+        # Sem fila para o lote: rejeita se o conjunto excede o orçamento de
+        # jobs, qualquer que seja o motor (o loop de referência é o limite).
+        # No vetorizado a estimativa sai das tuplas, sem criar Process
+        if vectorized:
+            costs = [cost_model.estimate_tuples(workload, algorithm, config) for workload in workloads]
+        else:
+            processes_list = [resolve_processes(workload) for workload in workloads_data]
+            costs = [cost_model.estimate(processes, algorithm, config) for processes in processes_list]
+        seconds = sum(cost.seconds(cost_model.METRICS) for cost in costs)
+        if seconds > admission.job_seconds:
+            return jsonify({
+                'error': 'Tempo estimado do lote excede o orçamento',
+                'estimate': {'seconds': round(seconds, 6)},
+                'budget': admission.to_dict()
+            }), 413
+
+        results = []
+        start = time.perf_counter()
+        if vectorized:
+            metrics = engine.simulate_batch(workloads, algorithm, config)
+            for i in range(len(workloads)):
+                makespan = int(metrics['makespan'][i])
+                idle = int(metrics['cpu_idle_time'][i])
+                results.append({
+                    'avgTurnaroundTime': float(metrics['avg_tt'][i]),
+                    'avgWaitingTime': float(metrics['avg_wt'][i]),
+                    'contextSwitches': int(metrics['context_switches'][i]),
+                    'cpuIdleTime': idle,
+                    'cpuUtilization': (makespan - idle) / makespan if makespan else 0.0,
+                    'makespan': makespan
+                })
+        else:
+            strategy = simulator.strategies[algorithm]
+            for processes in processes_list:
+                run = SimulationRun(diagram=False)
+                avg_tt, avg_wt, context_switches, _ = strategy.schedule(processes, config, run)
+                results.append({
+                    'avgTurnaroundTime': avg_tt,
+                    'avgWaitingTime': avg_wt,
+                    'contextSwitches': context_switches,
+                    'cpuIdleTime': run.cpu_idle_time,
+                    'cpuUtilization': run.cpu_utilization,
+                    'makespan': run.makespan
+                })
+
+        _observe_simulation(algorithm, 'batch', sum(r['makespan'] for r in results),
+                            time.perf_counter() - start, count=len(results))
+
+        return jsonify({
+            'success': True,
+            'algorithm': algorithm,
+            'engine': 'vectorized' if vectorized else 'reference',
+            'results': results
+        })
+
+    except WorkloadNotFound as e:
+        return jsonify({'error': f"Carga '{e}' não encontrada ou expirada"}), 404
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/api/results/<result_id>/timeline', methods=['GET'])
+def get_timeline(result_id):
+    """
+    Retorna uma janela [start, end) da linha do tempo de um resultado,
+    opcionalmente só de alguns processos (?processes=P1,P2). Janelas
+    longas vêm agregadas em baldes (estado dominante) para caber em
+    maxPoints por processo.
+    """
+    index = result_store.get(result_id)
+    RESULT_LOOKUPS.inc(result='miss' if index is None else 'hit')
+    if index is None:
+        return jsonify({'error': f"Resultado '{result_id}' não encontrado ou expirado"}), 404
+    try:
+        start = int(request.args.get('start', 0))
+        end = request.args.get('end')
+        end = int(end) if end is not None else None
+        max_points = int(request.args.get('maxPoints', DEFAULT_MAX_POINTS))
+    except ValueError:
+        return jsonify({'error': 'start, end e maxPoints devem ser inteiros'}), 400
+    pids = request.args.get('processes')
+    pids = pids.split(',') if pids else None
+
+    window = index.query(start, end, pids, max_points)
+    window['resultId'] = result_id
+    return jsonify(window)
+
+def _store_job_result(output):
+    """Guarda o índice da linha do tempo de um job concluído (no processo da API)."""
+    result, index = output
+    _observe_simulation(result['algorithm'], 'job', result['makespan'])
+    if index is not None:
+        result['resultId'] = result_store.put(index)
+    return result
+
+@app.route('/api/jobs', methods=['POST'])
+def submit_job():
+    """
+    Agenda uma simulação (mesmo corpo de /api/simulate) em segundo plano
+    e retorna o id do job imediatamente.
+    """
+    try:
+        data = request.get_json()
+        if not data.get('processes') and not data.get('workload'):
+            return jsonify({'error': 'Nenhum processo fornecido'}), 400
+        if data.get('algorithm', 'FCFS') not in simulator.strategies:
+            return jsonify({'error': f"Estratégia '{data.get('algorithm')}' desconhecida."}), 400
+
+        # Aqui a fila já é o destino: só rejeita ou rebaixa para métricas
+        processes = resolve_processes(data.get('workload') or data.get('processes'))
+        decision, data, info = _admit(data, processes)
+        if decision == cost_model.REJECT:
+            return _rejected(info)
+
+        # O formato do resultado só é negociado na busca: indexa sempre
+        job = job_manager.submit(run_simulation, {**data, 'index': True}, on_done=_store_job_result)
+        response = job.to_dict()
+        if decision != cost_model.ACCEPT:
+            response['admission'] = info
+        return jsonify(response), 202
+
+    except WorkloadNotFound as e:
+        return jsonify({'error': f"Carga '{e}' não encontrada ou expirada"}), 404
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
+@app.route('/api/jobs/<job_id>', methods=['GET'])
+def get_job(job_id):
+    """Estado e progresso (0.0 a 1.0) de um job."""
+    job = job_manager.get(job_id)
+    if job is None:
+        return jsonify({'error': f"Job '{job_id}' não encontrado"}), 404
+    return jsonify(job.to_dict())
+
+@app.route('/api/jobs/<job_id>/result', methods=['GET'])
+def get_job_result(job_id):
+    """Resultado de um job concluído (mesmo formato de /api/simulate)."""
+    job = job_manager.get(job_id)
+    if job is None:
+        return jsonify({'error': f"Job '{job_id}' não encontrado"}), 404
+    if job.status == COMPLETED:
+        fmt = _negotiate_format()
+        if fmt is None:
+            return _not_acceptable()
+        result = job.result
+        if fmt != wire_format.JSON:
+            result = {k: v for k, v in result.items() if k not in ('diagramData', 'rawDiagram')}
+            index = result_store.get(result.get('resultId'))
+            if 'diagramData' in job.result and index is not None:
+                result['diagramRuns'] = index.runs()
+        return encode_response(result, fmt)
+    if job.status == FAILED:
+        return jsonify({'error': job.error, **job.to_dict()}), 500
+    if job.status == CANCELLED:
+        return jsonify({'error': 'Job cancelado', **job.to_dict()}), 410
+    return jsonify({'error': 'Job ainda não concluído', **job.to_dict()}), 409
+
+@app.route('/api/jobs/<job_id>', methods=['DELETE'])
+@app.route('/api/jobs/<job_id>/cancel', methods=['POST'])
+def cancel_job(job_id):
+    """Cancela um job na fila ou pede a parada cooperativa da simulação."""
+    job = job_manager.cancel(job_id)
+    if job is None:
+        return jsonify({'error': f"Job '{job_id}' não encontrado"}), 404
+    return jsonify(job.to_dict()), 202
+
+@app.route('/api/workloads', methods=['POST'])
+def upload_workload():
+    """
+    Armazena uma carga uma única vez e retorna seu handle, que pode ser
+    usado no lugar de 'processes' (simulate) ou de cada carga (batch).
+    """
+    try:
+        data = request.get_json()
+        processes_data = data.get('processes', [])
+        if not processes_data:
+            return jsonify({'error': 'Nenhum processo fornecido'}), 400
+
+        handle = workload_store.put(build_processes(processes_data))
+        stored = workload_store.get(handle)
+        return jsonify({
+            'success': True,
+            'handle': handle,
+            'processCount': stored.count,
+            'bytes': stored.nbytes,
+            'ttl': workload_store.ttl
+        }), 201
+
+    except WorkloadTooLarge as e:
+        return jsonify({'error': str(e), 'bytes': e.nbytes, 'maxBytes': e.max_bytes}), 413
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/api/workloads/<handle>', methods=['GET'])
+def get_workload(handle):
+    """Retorna as informações de uma carga armazenada."""
+    try:
+        stored = workload_store.get(handle)
+        return jsonify({'handle': handle, 'processCount': stored.count, 'bytes': stored.nbytes})
+    except WorkloadNotFound:
+        return jsonify({'error': f"Carga '{handle}' não encontrada ou expirada"}), 404
+
+@app.route('/api/workloads/<handle>', methods=['DELETE'])
+def delete_workload(handle):
+    """Remove uma carga armazenada."""
+    try:
+        if workload_store.delete(handle):
+            return jsonify({'success': True})
+    except WorkloadNotFound:
+        pass
+    return jsonify({'error': f"Carga '{handle}' não encontrada ou expirada"}), 404
+
 def parse_diagram(diagram_str, processes):
     """Converte o diagrama de texto para formato JSON estruturado"""
     lines = diagram_str.strip().split('\n')
@@ -136,6 +727,8 @@ def parse_diagram(diagram_str, processes):
                     state = 'running'
                 elif state_symbol == '--':
                     state = 'waiting'
+                elif state_symbol == 'IO':
+                    state = 'blocked'
                 elif state_symbol == '✓':
                     state = 'completed'
                 elif state_symbol == '  ' or state_symbol == '':
@@ -165,56 +758,13 @@ def parse_diagram(diagram_str, processes):
 
 @app.route('/api/algorithms', methods=['GET'])
 def get_algorithms():
-    """Retorna lista de algoritmos disponíveis"""
-    algorithms = [
-        {
-            'id': 'FCFS',
-            'name': 'First-Come First-Served',
-            'description': 'Processos são executados na ordem de chegada',
-            'preemptive': False
-        },
-        {
-            'id': 'SJF',
-            'name': 'Shortest Job First',
-            'description': 'Processo com menor duração executa primeiro',
-            'preemptive': False
-        },
-        {
-            'id': 'SRTF',
-            'name': 'Shortest Remaining Time First',
-            'description': 'Versão preemptiva do SJF',
-            'preemptive': True
-        },
-        {
-            'id': 'PriorityNP',
-            'name': 'Priority (Non-Preemptive)',
-            'description': 'Executa por prioridade sem preempção',
-            'preemptive': False
-        },
-        {
-            'id': 'PriorityP',
-            'name': 'Priority (Preemptive)',
-            'description': 'Executa por prioridade com preempção',
-            'preemptive': True
-        },
-        {
-            'id': 'RoundRobin',
-            'name': 'Round Robin',
-            'description': 'Execução em fatias de tempo (quantum)',
-            'preemptive': True,
-            'needsQuantum': True
-        },
-        {
-            'id': 'RoundRobinPriorityAging',
-            'name': 'Round Robin com Prioridade e Envelhecimento',
-            'description': 'RR com prioridade e aumento de prioridade ao longo do tempo',
-            'preemptive': True,
-            'needsQuantum': True,
-            'needsAging': True
-        }
-    ]
-    
-    return jsonify({'algorithms': algorithms})
+    """Retorna lista de algoritmos disponíveis (embutidos e plugins)"""
+    return jsonify({'algorithms': simulator.strategies.describe()})
+
+@app.route('/api/metrics', methods=['GET'])
+def metrics():
+    """Métricas do servidor no formato texto do Prometheus."""
+    return Response(registry.render(), content_type=telemetry.CONTENT_TYPE)
 
 @app.route('/api/health', methods=['GET'])
 def health_check():
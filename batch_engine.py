@@ -0,0 +1,245 @@
+#!/usr/bin/env python3
+
+import numpy as np
+
+from SchedulerNoGUI import DISPATCH, PREEMPT, COMPLETE
+
+"""
+Motor vetorizado: simula milhares de cargas pequenas e independentes em
+passo único (lockstep), com arrays NumPy indexados por (carga, processo).
+Reproduz exatamente as regras de seleção e desempate das estratégias de
+SchedulerNoGUI para cargas puramente CPU-bound.
+"""
+
+# Estratégias suportadas -> (tipo de loop, chave primária de seleção)
+SUPPORTED = {
+    'FCFS': ('nonpreemptive', 'creation'),
+    'SJF': ('nonpreemptive', 'duration'),
+    'PriorityNP': ('nonpreemptive', 'priority'),
+    'SRTF': ('preemptive', 'remaining'),
+    'PriorityP': ('preemptive', 'priority'),
+    'RoundRobin': ('roundrobin', None),
+}
+
+_INF = np.iinfo(np.int64).max
+
+
+def _id_ranks(n):
+    """Posição de cada id 'P1'..'Pn' na ordenação por string (como sorted(pids))."""
+    order = sorted(range(n), key=lambda i: f"P{i+1}")
+    ranks = np.empty(n, dtype=np.int64)
+    ranks[order] = np.arange(n)
+    return ranks
+
+
+def _select(mask, keys):
+    """
+    Para cada linha, escolhe a coluna com menor chave lexicográfica entre
+    as marcadas em 'mask'. Retorna (índice escolhido, linha tem candidato).
+    """
+    eligible = mask.copy()
+    for key in keys:
+        key_min = np.where(eligible, key, _INF).min(axis=1, keepdims=True)
+        eligible &= key == key_min
+    return eligible.argmax(axis=1), mask.any(axis=1)
+
+
+def _trace_dispatch(traces, occupant, rows, cols, time):
+    """Eventos de troca de ocupante da CPU, como em SimulationRun."""
+    for b, c in zip(rows.tolist(), cols.tolist()):
+        if occupant[b] != c:
+            if occupant[b] >= 0:
+                traces[b].append((time, PREEMPT, f"P{occupant[b] + 1}"))
+            traces[b].append((time, DISPATCH, f"P{c + 1}"))
+            occupant[b] = c
+
+
+def simulate_batch(workloads, algorithm, config=None, trace=False):
+    """
+    Simula uma lista de cargas, cada uma uma lista de tuplas
+    (instante de criação, duração, prioridade) com ids implícitos P1..Pn.
+    Retorna um dict de arrays (um valor por carga): avg_tt, avg_wt,
+    context_switches, makespan e cpu_idle_time. Com trace=True inclui
+    'traces', a lista de eventos de cada carga (ver tracing.py).
+    """
+    if algorithm not in SUPPORTED:
+        raise ValueError(f"Estratégia '{algorithm}' não suportada no modo vetorizado.")
+    kind, primary = SUPPORTED[algorithm]
+    quantum = int((config or {}).get('quantum', 2))
+    # Como no loop de referência, quantum <= 0 nunca estoura
+    expires = kind == 'roundrobin' and quantum > 0
+
+    batch = len(workloads)
+    width = max((len(w) for w in workloads), default=0)
+    rows = np.arange(batch)
+
+    # --- Arrays (carga x processo), completados com colunas inválidas ---
+    valid = np.zeros((batch, width), dtype=bool)
+    creation = np.zeros((batch, width), dtype=np.int64)
+    duration = np.zeros((batch, width), dtype=np.int64)
+    priority = np.zeros((batch, width), dtype=np.int64)
+    id_rank = np.zeros((batch, width), dtype=np.int64)
+    rank_cache = {}
+    for b, workload in enumerate(workloads):
+        n = len(workload)
+        if n == 0:
+            continue
+        data = np.asarray(workload, dtype=np.int64).reshape(n, 3)
+        valid[b, :n] = True
+        creation[b, :n], duration[b, :n], priority[b, :n] = data[:, 0], data[:, 1], data[:, 2]
+        if n not in rank_cache:
+            rank_cache[n] = _id_ranks(n)
+        id_rank[b, :n] = rank_cache[n]
+    if (duration[valid] <= 0).any():
+        raise ValueError("Duração dos processos deve ser positiva.")
+
+    remaining = duration.copy()
+    completion = np.zeros((batch, width), dtype=np.int64)
+    running = np.full(batch, -1, dtype=np.int64)
+    switches = np.zeros(batch, dtype=np.int64)
+    quantum_slice = np.zeros(batch, dtype=np.int64)
+    ready = np.zeros((batch, width), dtype=bool)
+    ready_count = np.zeros(batch, dtype=np.int64)
+
+    # Chegadas como lista de eventos ordenada pelo instante: cada passo só
+    # toca as cargas com chegada, decisão ou CPU ocupada.
+    event_rows, event_cols = np.nonzero(valid)
+    order = np.argsort(creation[event_rows, event_cols], kind='stable')
+    event_rows, event_cols = event_rows[order], event_cols[order]
+    event_times = creation[event_rows, event_cols]
+    next_event = 0
+
+    # Fila FIFO do RR como chave de ordenação: chegadas em t entram na
+    # posição (t, 1, id); quem estoura o quantum em t entra em (t+1, 0),
+    # antes das chegadas do instante seguinte (como no deque original).
+    slot = 2 * (width + 1)
+    queue_key = creation * slot + (width + 1) + id_rank
+
+    static_keys = {'creation': creation, 'duration': duration, 'priority': priority}
+    traces = [[] for _ in range(batch)] if trace else None
+    occupant = [-1] * batch
+    left = int(valid.sum())
+    current_time = 0
+
+    while left:
+        # 1. Chegadas do instante atual
+        arrived_rows = np.empty(0, dtype=np.int64)
+        last = np.searchsorted(event_times, current_time, side='right')
+        if last > next_event:
+            arrived_rows = event_rows[next_event:last]
+            ready[arrived_rows, event_cols[next_event:last]] = True
+            ready_count += np.bincount(arrived_rows, minlength=batch)
+            next_event = last
+
+        # 2. Seleção, só nas cargas que precisam decidir agora
+        if kind == 'preemptive':
+            # Chegadas podem preemptar; CPU livre precisa de um novo processo
+            decide = np.flatnonzero(((running < 0) & (ready_count > 0))
+                                    | np.isin(rows, arrived_rows))
+            if decide.size:
+                current = running[decide]
+                busy = current >= 0
+                sub = np.arange(decide.size)
+                candidates = ready[decide]
+                candidates[sub[busy], current[busy]] = True
+                key_source = remaining if primary == 'remaining' else static_keys[primary]
+                key = key_source[decide]
+                key_min = np.where(candidates, key, _INF).min(axis=1)
+                # (i) desempate: o processo em execução continua se empatou
+                keep = busy & (key[sub, np.maximum(current, 0)] == key_min)
+                chosen, _ = _select(candidates, (key, remaining[decide], id_rank[decide]))
+                chosen = np.where(keep, current, chosen)
+
+                changed = chosen != current
+                preempted = changed & busy
+                ready[decide[preempted], current[preempted]] = True
+                ready_count[decide[preempted]] += 1
+                ready[decide[changed], chosen[changed]] = False
+                ready_count[decide[changed]] -= 1
+                running[decide[changed]] = chosen[changed]
+                switches[decide[changed]] += 1
+                if traces is not None:
+                    _trace_dispatch(traces, occupant, decide[changed], chosen[changed], current_time)
+        else:
+            decide = np.flatnonzero((running < 0) & (ready_count > 0))
+            if decide.size:
+                if kind == 'nonpreemptive':
+                    keys = (static_keys[primary][decide], remaining[decide], id_rank[decide])
+                else:
+                    keys = (queue_key[decide],)
+                chosen, _ = _select(ready[decide], keys)
+                ready[decide, chosen] = False
+                ready_count[decide] -= 1
+                running[decide] = chosen
+                quantum_slice[decide] = 0
+                switches[decide] += 1
+                if traces is not None:
+                    _trace_dispatch(traces, occupant, decide, chosen, current_time)
+
+        active = np.flatnonzero(running >= 0)
+        if not active.size:
+            # Todas as cargas ociosas: salta para a próxima chegada
+            current_time = int(event_times[next_event])
+            continue
+
+        # 3. Avança as cargas com CPU ocupada até a próxima decisão: término,
+        # fim de quantum com outro processo na fila, ou chegada (em qualquer
+        # carga). Entre decisões cada carga só executa o processo atual.
+        current = running[active]
+        run_length = remaining[active, current]
+        if expires:
+            contended = ready_count[active] > 0
+            run_length = np.where(contended, np.minimum(run_length, quantum - quantum_slice[active]),
+                                  run_length)
+        delta = int(run_length.min())
+        if next_event < event_times.size:
+            delta = min(delta, int(event_times[next_event]) - current_time)
+        end_time = current_time + delta
+
+        remaining[active, current] -= delta
+        if expires:
+            # Sem ninguém na fila, o quantum estoura e o mesmo processo volta
+            # à CPU (uma troca por estouro, como no loop de referência); só
+            # o estouro na última unidade segue pelo caminho normal abaixo
+            total = quantum_slice[active] + delta
+            expiries = (total - 1) // quantum
+            switches[active] += expiries
+            quantum_slice[active] = total - expiries * quantum
+        else:
+            quantum_slice[active] += delta
+
+        finished = remaining[active, current] == 0
+        completion[active[finished], current[finished]] = end_time
+        running[active[finished]] = -1
+        left -= int(finished.sum())
+        if traces is not None:
+            for b, c in zip(active[finished].tolist(), current[finished].tolist()):
+                traces[b].append((end_time, COMPLETE, f"P{c + 1}"))
+                occupant[b] = -1
+
+        if expires:
+            expired = ~finished & (quantum_slice[active] == quantum)
+            expired_rows, expired_cols = active[expired], current[expired]
+            queue_key[expired_rows, expired_cols] = end_time * slot
+            ready[expired_rows, expired_cols] = True
+            ready_count[expired_rows] += 1
+            running[expired_rows] = -1
+
+        current_time = end_time
+
+    # --- Métricas por carga ---
+    counts = valid.sum(axis=1)
+    safe_counts = np.maximum(counts, 1)
+    turnaround = np.where(valid, completion - creation, 0)
+    waiting = np.where(valid, turnaround - duration, 0)
+    makespan = completion.max(axis=1, initial=0)
+    result = {
+        'avg_tt': turnaround.sum(axis=1) / safe_counts,
+        'avg_wt': waiting.sum(axis=1) / safe_counts,
+        'context_switches': np.maximum(switches - 1, 0),
+        'makespan': makespan,
+        'cpu_idle_time': makespan - duration.sum(axis=1),
+    }
+    if traces is not None:
+        result['traces'] = traces
+    return result
@@ -0,0 +1,176 @@
+#!/usr/bin/env python3
+
+import os
+
+"""
+Estimativa de custo (tempo e memória) de uma simulação antes de executá-la
+e controle de admissão das requisições da API. O tempo do loop de referência
+cresce com as unidades de tempo com CPU ocupada (uma iteração por unidade) e,
+nas estratégias que varrem a fila de prontos, com o número de processos; o
+diagrama e o índice de linha do tempo crescem com processos x makespan.
+"""
+
+# Modos de execução, do mais caro ao mais barato
+FULL = 'full'           # diagramData + rawDiagram (+ índice da linha do tempo, se pedido)
+TIMELINE = 'timeline'   # só o índice da linha do tempo (resultId / diagramRuns)
+METRICS = 'metrics'     # só as métricas, sem diagrama
+
+# Decisões de admissão
+ACCEPT, DOWNGRADE, QUEUE, REJECT = 'accept', 'downgrade', 'queue', 'reject'
+
+# Custo por unidade de tempo com CPU ocupada (ns): fixo + por processo.
+# SRTF/PriorityP buscam o mínimo entre os prontos a cada unidade (em média
+# bem menos que todos os processos); o aging percorre a fila de prontos a
+# cada quantum (o termo é dividido por ele).
+TICK_NS = {
+    'FCFS': (1300, 0),
+    'SJF': (1300, 0),
+    'PriorityNP': (1300, 0),
+    'SRTF': (4000, 6),
+    'PriorityP': (4000, 6),
+    'RoundRobin': (1700, 0),
+    'RoundRobinPriorityAging': (3000, 25),
+    'Stride': (1500, 0),
+    'Lottery': (2500, 0),
+}
+DEFAULT_TICK_NS = (4000, 10)  # Estratégia sem calibração: caso pessimista
+# Nas não preemptivas cada despacho varre a fila de prontos
+DISPATCH_NS_PER_PROCESS = {'FCFS': 50, 'SJF': 50, 'PriorityNP': 50}
+PROCESS_NS = 5000  # Criação e cópia de cada Process
+
+# Custo por célula (processo x unidade de tempo) do diagrama
+CELL_NS = {FULL: 1500, TIMELINE: 900, METRICS: 0}
+CELL_BYTES = {FULL: 48, TIMELINE: 16, METRICS: 0}
+PROCESS_BYTES = 2048  # Objeto Process e sua cópia
+
+# Orçamentos (ajustáveis por variáveis de ambiente)
+SYNC_SECONDS = float(os.environ.get('SCHEDULER_SYNC_BUDGET_SECONDS', 2.0))
+JOB_SECONDS = float(os.environ.get('SCHEDULER_JOB_BUDGET_SECONDS', 300.0))
+MEMORY_BYTES = int(float(os.environ.get('SCHEDULER_MEMORY_BUDGET_MB', 256)) * 1024 * 1024)
+# Multiplicador para máquinas mais lentas/rápidas que a de calibração
+COST_SCALE = float(os.environ.get('SCHEDULER_COST_SCALE', 1.0))
+
+
+class CostEstimate:
+    """Tamanho da carga e custo previsto da simulação em cada modo."""
+    def __init__(self, algorithm, process_count, total_burst, total_io, makespan, quantum=2, scale=COST_SCALE,
+                 runs=1.0):
+        self.algorithm = algorithm
+        self.process_count = process_count
+        self.total_burst = total_burst
+        self.total_io = total_io
+        self.makespan = makespan
+        self.quantum = max(1, quantum)
+        self.scale = scale
+        # Execuções equivalentes da mesma carga, em sequência (ex: ajuste de parâmetros)
+        self.runs = runs
+
+    @property
+    def cells(self):
+        """Células do diagrama: uma por processo por unidade de tempo."""
+        return self.process_count * self.makespan
+
+    def seconds(self, mode=FULL):
+        """Tempo previsto de execução (segundos) no modo dado."""
+        n = self.process_count
+        fixed, per_process = TICK_NS.get(self.algorithm, DEFAULT_TICK_NS)
+        if self.algorithm == 'RoundRobinPriorityAging':
+            per_process /= self.quantum
+        ns = self.total_burst * (fixed + per_process * n)
+        ns += n * n * DISPATCH_NS_PER_PROCESS.get(self.algorithm, 0)
+        ns += n * PROCESS_NS
+        ns += self.cells * CELL_NS[mode]
+        return ns * self.runs * self.scale / 1e9
+
+    def memory(self, mode=FULL):
+        """Memória prevista (bytes) no modo dado."""
+        return self.process_count * PROCESS_BYTES + self.cells * CELL_BYTES[mode]
+
+    def to_dict(self, mode=FULL):
+        info = {
+            'processCount': self.process_count,
+            'totalBurst': self.total_burst,
+            'makespan': self.makespan,
+            'seconds': round(self.seconds(mode), 6),
+            'memoryBytes': self.memory(mode),
+        }
+        if self.runs != 1:
+            info['runs'] = round(self.runs, 3)
+        return info
+
+
+def estimate(processes, algorithm, config=None):
+    """
+    Estima o custo de simular 'processes' (objetos Process) com a estratégia.
+    O makespan é exato para cargas só de CPU (todas as estratégias mantêm a
+    CPU ocupada se há alguém pronto); com E/S é um limite inferior.
+    """
+    total_burst = total_io = 0
+    cpu_makespan = longest = 0
+    for p in sorted(processes, key=lambda p: p.creation_time):
+        total_burst += p.duration
+        total_io += p.io_time
+        cpu_makespan = max(cpu_makespan, p.creation_time) + p.duration
+        longest = max(longest, p.creation_time + p.duration + p.io_time)
+    quantum = int((config or {}).get('quantum') or 2)
+    return CostEstimate(algorithm, len(processes), total_burst, total_io,
+                        max(cpu_makespan, longest), quantum)
+
+
+def estimate_tuples(workload, algorithm, config=None):
+    """
+    Como estimate(), a partir das tuplas (criação, duração, prioridade) de
+    uma carga só de CPU (motor vetorizado), sem criar objetos Process.
+    """
+    total_burst = makespan = 0
+    for creation, duration, _ in sorted(workload):
+        total_burst += duration
+        makespan = max(makespan, creation) + duration
+    quantum = int((config or {}).get('quantum') or 2)
+    return CostEstimate(algorithm, len(workload), total_burst, 0, makespan, quantum)
+
+
+class AdmissionPolicy:
+    """
+    Decide o destino de uma requisição a partir da estimativa:
+    - reject: nem só as métricas cabem no orçamento (de jobs/memória, ou no
+      limite síncrono se o cliente não aceita resposta assíncrona);
+    - downgrade: o diagrama não cabe, mas as métricas sim (modo metrics);
+    - queue: cabe, mas demora demais para uma resposta síncrona (vira job;
+      só se o cliente aceitar resposta assíncrona, 'allow_queue');
+    - accept: executa na hora, no modo pedido.
+    """
+    def __init__(self, sync_seconds=SYNC_SECONDS, job_seconds=JOB_SECONDS, memory_bytes=MEMORY_BYTES):
+        self.sync_seconds = sync_seconds
+        self.job_seconds = job_seconds
+        self.memory_bytes = memory_bytes
+
+    def decide(self, cost, mode=FULL, allow_queue=True):
+        """Retorna (decisão, modo de execução, motivo ou None)."""
+        # Sem fila tudo roda na própria requisição: vale o limite síncrono
+        limit = self.job_seconds if allow_queue else self.sync_seconds
+        decision, reason, requested = ACCEPT, None, mode
+        if mode != METRICS and (cost.memory(mode) > self.memory_bytes
+                                or cost.seconds(mode) > limit):
+            decision, mode = DOWNGRADE, METRICS
+            reason = 'Diagrama excede o orçamento; retornando só as métricas'
+            if (not allow_queue and cost.seconds(requested) <= self.job_seconds
+                    and cost.memory(requested) <= self.memory_bytes):
+                reason += ' (para o diagrama, repita com "async": true ou Prefer: respond-async)'
+        if cost.memory(mode) > self.memory_bytes:
+            return REJECT, mode, 'Memória estimada excede o orçamento'
+        if cost.seconds(mode) > self.job_seconds:
+            return REJECT, mode, 'Tempo estimado excede o orçamento'
+        if cost.seconds(mode) > self.sync_seconds:
+            if not allow_queue:
+                return REJECT, mode, ('Tempo estimado excede o limite síncrono; '
+                                      'repita com "async": true ou Prefer: respond-async')
+            return QUEUE, mode, 'Tempo estimado excede o limite síncrono; executando em segundo plano'
+        return decision, mode, reason
+
+    def to_dict(self):
+        return {
+            'syncSeconds': self.sync_seconds,
+            'jobSeconds': self.job_seconds,
+            'memoryBytes': self.memory_bytes,
+        }
@@ -0,0 +1,191 @@
+#!/usr/bin/env python3
+
+import os
+import time
+import uuid
+import threading
+import multiprocessing
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor, CancelledError
+
+from SchedulerNoGUI import SimulationCancelled
+
+"""
+Fila de tarefas (jobs) para simulações longas: a requisição só agenda a
+execução em um pool de processos e devolve um id. O progresso é publicado
+periodicamente pelo loop de simulação e o cancelamento é cooperativo
+(verificado pelo monitor do SimulationRun).
+"""
+
+JOB_WORKERS = int(os.environ.get('SCHEDULER_JOB_WORKERS', os.cpu_count() or 1))
+MAX_FINISHED_JOBS = int(os.environ.get('SCHEDULER_MAX_FINISHED_JOBS', 256))
+# Memória (estimada) dos resultados guardados de jobs finalizados
+MAX_FINISHED_BYTES = int(float(os.environ.get('SCHEDULER_MAX_FINISHED_JOB_MB', 256)) * 1024 * 1024)
+PROGRESS_PERIOD = 0.25  # Segundos entre publicações de progresso
+
+# Estados de um job
+QUEUED, RUNNING, COMPLETED, FAILED, CANCELLED = 'queued', 'running', 'completed', 'failed', 'cancelled'
+FINISHED = (COMPLETED, FAILED, CANCELLED)
+
+
+def _execute(fn, args, shared):
+    """
+    Executado no processo trabalhador: roda fn(*args, monitor=...) e
+    publica progresso/consulta cancelamento no dict compartilhado.
+    """
+    shared['status'] = RUNNING
+    shared['startedAt'] = time.time()
+    last_publish = [0.0]
+
+    def monitor(run):
+        now = time.monotonic()
+        if now - last_publish[0] < PROGRESS_PERIOD:
+            return
+        last_publish[0] = now
+        shared['progress'] = run.progress
+        if shared.get('cancel'):
+            raise SimulationCancelled()
+
+    return fn(*args, monitor=monitor)
+
+
+class Job:
+    """Registro de um job no processo da API."""
+    def __init__(self, job_id, shared, on_done):
+        self.id = job_id
+        self.shared = shared
+        self.on_done = on_done
+        self.future = None
+        self.submitted_at = time.time()
+        self.finished_at = None
+        self.status = QUEUED
+        self.result = None
+        self.error = None
+        self.nbytes = 0  # Tamanho estimado do resultado guardado
+
+    @property
+    def current_status(self):
+        """Estado atual (enquanto não termina, vem do processo trabalhador)."""
+        if self.status in FINISHED:
+            return self.status
+        return self._shared('status', self.status)
+
+    def to_dict(self):
+        info = {
+            'jobId': self.id,
+            'status': self.current_status,
+            'progress': 1.0 if self.status == COMPLETED else self._shared('progress', 0.0),
+            'submittedAt': self.submitted_at,
+        }
+        started_at = self._shared('startedAt')
+        if started_at:
+            info['startedAt'] = started_at
+        if self.finished_at:
+            info['finishedAt'] = self.finished_at
+        if self.error:
+            info['error'] = self.error
+        return info
+
+    def _shared(self, key, default=None):
+        try:
+            return self.shared.get(key, default)
+        except (OSError, EOFError):
+            return default  # Gerenciador já encerrado
+
+
+class JobManager:
+    """
+    Agenda funções em um ProcessPoolExecutor (criado sob demanda, para não
+    pesar na inicialização) e acompanha estado, progresso e resultado.
+    Jobs finalizados são descartados (mais antigos primeiro) além de
+    'max_finished' jobs ou de 'max_finished_bytes', medidos por 'sizeof'
+    (função resultado -> bytes estimados; sem ela, só a contagem vale).
+    """
+    def __init__(self, workers=JOB_WORKERS, max_finished=MAX_FINISHED_JOBS,
+                 max_finished_bytes=MAX_FINISHED_BYTES, sizeof=None):
+        self.workers = workers
+        self.max_finished = max_finished
+        self.max_finished_bytes = max_finished_bytes
+        self.sizeof = sizeof
+        self._jobs = OrderedDict()
+        self._lock = threading.Lock()
+        self._pool = None
+        self._manager = None
+
+    def _ensure_pool(self):
+        if self._pool is None:
+            self._manager = multiprocessing.Manager()
+            self._pool = ProcessPoolExecutor(max_workers=self.workers)
+        return self._pool
+
+    def submit(self, fn, *args, on_done=None):
+        """
+        Agenda fn(*args, monitor=...). 'on_done(result)' roda no processo da
+        API ao concluir e pode transformar o resultado antes de guardá-lo.
+        """
+        with self._lock:
+            pool = self._ensure_pool()
+            shared = self._manager.dict(status=QUEUED, progress=0.0, cancel=False)
+            job = Job(uuid.uuid4().hex, shared, on_done)
+            job.future = pool.submit(_execute, fn, args, shared)
+            self._jobs[job.id] = job
+            self._trim()
+        job.future.add_done_callback(lambda future: self._finish(job, future))
+        return job
+
+    def _finish(self, job, future):
+        try:
+            result = future.result()
+            job.result = job.on_done(result) if job.on_done else result
+            job.nbytes = self.sizeof(job.result) if self.sizeof else 0
+            job.status = COMPLETED
+        except (CancelledError, SimulationCancelled):
+            job.status = CANCELLED
+        except Exception as e:
+            job.status = FAILED
+            job.error = str(e)
+        job.finished_at = time.time()
+        with self._lock:
+            self._trim(keep=job.id)
+
+    def get(self, job_id):
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def cancel(self, job_id):
+        """Cancela o job: retira da fila ou pede a parada cooperativa."""
+        job = self.get(job_id)
+        if job is None or job.status in FINISHED:
+            return job
+        if not job.future.cancel():
+            job.shared['cancel'] = True
+        return job
+
+    def stats(self):
+        """Quantidade de jobs por estado."""
+        with self._lock:
+            jobs = list(self._jobs.values())
+        counts = {status: 0 for status in (QUEUED, RUNNING) + FINISHED}
+        for job in jobs:
+            counts[job.current_status] += 1
+        return counts
+
+    def _trim(self, keep=None):
+        """
+        Descarta os jobs finalizados mais antigos além dos limites de
+        quantidade e de memória ('keep': o que acabou de terminar fica).
+        """
+        finished = [job for job in self._jobs.values() if job.status in FINISHED and job.id != keep]
+        count = len(finished) + (keep is not None)
+        total = sum(job.nbytes for job in finished) + (self._jobs[keep].nbytes if keep in self._jobs else 0)
+        for job in finished:
+            if count <= self.max_finished and total <= self.max_finished_bytes:
+                break
+            del self._jobs[job.id]
+            count -= 1
+            total -= job.nbytes
+
+    def shutdown(self):
+        if self._pool is not None:
+            self._pool.shutdown(cancel_futures=True)
+            self._manager.shutdown()
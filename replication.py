@@ -0,0 +1,308 @@
+#!/usr/bin/env python3
+
+import os
+import sys
+import json
+import math
+import random
+import functools
+import argparse
+from statistics import NormalDist
+from concurrent.futures import ProcessPoolExecutor
+
+from SchedulerNoGUI import SchedulerSimulator, SimulationRun, Process
+
+"""
+Modo de replicação (Monte Carlo): gera R cargas aleatórias a partir de uma
+especificação de distribuições, executa as estratégias escolhidas em cada
+uma (em um pool de processos) e agrega as métricas com intervalos de
+confiança. Pode parar cedo quando o IC atinge a largura desejada.
+"""
+
+# Métricas coletadas em cada replicação
+METRICS = ('avg_tt', 'avg_wt', 'context_switches', 'cpu_utilization', 'makespan')
+
+# Especificação padrão da carga (cada campo pode ser sobrescrito)
+DEFAULT_SPEC = {
+    'processes': 10,
+    'arrival': {'dist': 'exponential', 'mean': 2.0},  # Intervalo entre chegadas
+    'duration': {'dist': 'uniform', 'low': 1, 'high': 10},
+    'priority': {'dist': 'uniform', 'low': 0, 'high': 5},
+    # E/S opcional: probabilidade de o processo ter rajadas de E/S
+    'io': None,
+}
+
+
+# --- Geração de Cargas ---
+
+def _sample(dist, rng, minimum=0):
+    """
+    Sorteia um inteiro da distribuição descrita por 'dist'.
+    Aceita um número (constante) ou um dict com 'dist' em:
+    constant, uniform, exponential, normal, choice.
+    """
+    if isinstance(dist, (int, float)):
+        return max(minimum, int(dist))
+
+    kind = dist.get('dist', 'constant')
+    if kind == 'constant':
+        value = dist['value']
+    elif kind == 'uniform':
+        value = rng.randint(int(dist['low']), int(dist['high']))
+    elif kind == 'exponential':
+        value = round(rng.expovariate(1.0 / float(dist['mean'])))
+    elif kind == 'normal':
+        value = round(rng.gauss(float(dist['mean']), float(dist['std'])))
+    elif kind == 'choice':
+        value = rng.choice(dist['values'])
+    else:
+        raise ValueError(f"Distribuição '{kind}' desconhecida.")
+    return max(minimum, int(value))
+
+def generate_workload(spec, seed):
+    """Gera a lista de processos de uma replicação (determinística pela semente)."""
+    spec = {**DEFAULT_SPEC, **spec}
+    rng = random.Random(seed)
+    n = _sample(spec['processes'], rng, minimum=1)
+    io = spec['io']
+
+    processes = []
+    arrival = 0
+    for i in range(n):
+        if i > 0:
+            arrival += _sample(spec['arrival'], rng)
+        duration = _sample(spec['duration'], rng, minimum=1)
+        priority = _sample(spec['priority'], rng)
+
+        bursts = None
+        if io and rng.random() < float(io.get('probability', 1.0)):
+            # [cpu, es, cpu, ...]: a duração sorteada é a 1ª rajada de CPU
+            bursts = [duration]
+            for _ in range(_sample(io.get('count', 1), rng, minimum=1)):
+                bursts.append(_sample(io.get('length', 2), rng, minimum=1))
+                bursts.append(_sample(spec['duration'], rng, minimum=1))
+
+        processes.append(Process(f"P{i+1}", arrival, duration, priority, bursts=bursts))
+    return processes
+
+
+# --- Execução das Replicações ---
+
+_worker_simulator = None
+
+def _run_chunk(spec, seeds, strategies, config):
+    """
+    Executa as estratégias sobre as cargas das sementes informadas.
+    Todas as estratégias usam a MESMA carga em cada replicação
+    (números aleatórios comuns), o que reduz a variância das comparações.
+    Retorna uma lista (por semente) de {estratégia: {métrica: valor}}.
+    """
+    global _worker_simulator
+    if _worker_simulator is None:
+        _worker_simulator = SchedulerSimulator()
+
+    results = []
+    for seed in seeds:
+        workload = generate_workload(spec, seed)
+        per_strategy = {}
+        for name in strategies:
+            run = SimulationRun(diagram=False)
+            processes_copy = [p.clone() for p in workload]
+            avg_tt, avg_wt, switches, _ = _worker_simulator.strategies[name].schedule(processes_copy, config, run)
+            per_strategy[name] = {
+                'avg_tt': avg_tt,
+                'avg_wt': avg_wt,
+                'context_switches': switches,
+                'cpu_utilization': run.cpu_utilization,
+                'makespan': run.makespan,
+            }
+        results.append(per_strategy)
+    return results
+
+
+class RunningStats:
+    """Média e variância incrementais (algoritmo de Welford)."""
+    def __init__(self):
+        self.n = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+
+    def add(self, value):
+        self.n += 1
+        delta = value - self.mean
+        self.mean += delta / self.n
+        self.m2 += delta * (value - self.mean)
+
+    @property
+    def std(self):
+        return math.sqrt(self.m2 / (self.n - 1)) if self.n > 1 else 0.0
+
+    def half_width(self, confidence):
+        """Meia-largura do IC da média (t de Student)."""
+        if self.n < 2:
+            return math.inf
+        return _t_quantile(confidence, self.n - 1) * self.std / math.sqrt(self.n)
+
+# Acima disto a expansão de Cornish-Fisher erra menos de 1e-4
+EXACT_T_MAX_DF = 100
+
+def _t_central(t, df):
+    """
+    P(|T| < t) da t de Student com 'df' inteiro, pela soma finita de
+    Abramowitz & Stegun (26.7.3 e 26.7.4).
+    """
+    theta = math.atan(t / math.sqrt(df))
+    sin, cos2 = math.sin(theta), math.cos(theta) ** 2
+    if df % 2:
+        if df == 1:
+            return 2 * theta / math.pi
+        term = total = math.cos(theta)
+        for k in range(3, df - 1, 2):
+            term *= cos2 * (k - 1) / k
+            total += term
+        return 2 / math.pi * (theta + sin * total)
+    term = total = 1.0
+    for k in range(2, df - 1, 2):
+        term *= cos2 * (k - 1) / k
+        total += term
+    return sin * total
+
+@functools.lru_cache(maxsize=1024)
+def _t_quantile(confidence, df):
+    """
+    Quantil bicaudal da t de Student: exato (bisseção na distribuição) até
+    EXACT_T_MAX_DF graus de liberdade; acima, expansão de Cornish-Fisher,
+    que subestima bastante o quantil com poucos graus de liberdade.
+    """
+    if df <= EXACT_T_MAX_DF:
+        low, high = 0.0, 1.0
+        while _t_central(high, df) < confidence:
+            high *= 2
+        for _ in range(100):
+            mid = (low + high) / 2
+            if _t_central(mid, df) < confidence:
+                low = mid
+            else:
+                high = mid
+        return (low + high) / 2
+    z = NormalDist().inv_cdf(0.5 + confidence / 2)
+    return (z + (z**3 + z) / (4 * df)
+            + (5 * z**5 + 16 * z**3 + 3 * z) / (96 * df**2))
+
+
+def run_replications(spec, strategies, replications, config, seed=0, workers=None,
+                     ci_width=None, metric='avg_wt', confidence=0.95,
+                     min_replications=10, chunk_size=8):
+    """
+    Executa até 'replications' replicações e agrega as métricas.
+    Se 'ci_width' for informado, para assim que a largura total do IC de
+    'metric' ficar abaixo dele para todas as estratégias (após ao menos
+    'min_replications'). workers=1 executa no próprio processo.
+    """
+    if metric not in METRICS:
+        raise ValueError(f"Métrica '{metric}' desconhecida.")
+    unknown = [s for s in strategies if s not in SchedulerSimulator().strategies]
+    if unknown:
+        raise ValueError(f"Estratégia '{unknown[0]}' desconhecida.")
+
+    # Sementes independentes da ordem de conclusão das tarefas
+    seed_rng = random.Random(seed)
+    seeds = [seed_rng.getrandbits(32) for _ in range(replications)]
+    stats = {name: {m: RunningStats() for m in METRICS} for name in strategies}
+
+    def accumulate(chunk_results):
+        for per_strategy in chunk_results:
+            for name, values in per_strategy.items():
+                for m, value in values.items():
+                    stats[name][m].add(value)
+
+    def precise_enough():
+        done = next(iter(stats.values()))[metric].n
+        if ci_width is None or done < min_replications:
+            return False
+        return all(2 * s[metric].half_width(confidence) <= ci_width for s in stats.values())
+
+    chunks = [seeds[i:i + chunk_size] for i in range(0, len(seeds), chunk_size)]
+    stopped_early = False
+
+    if workers == 1:
+        for i, chunk in enumerate(chunks):
+            accumulate(_run_chunk(spec, chunk, strategies, config))
+            if precise_enough():
+                stopped_early = i + 1 < len(chunks)
+                break
+    else:
+        workers = workers or os.cpu_count() or 1
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            # Submete em ondas para poder parar cedo sem desperdiçar CPU
+            wave = workers * 2
+            for start in range(0, len(chunks), wave):
+                futures = [pool.submit(_run_chunk, spec, chunk, strategies, config)
+                           for chunk in chunks[start:start + wave]]
+                # Agrega na ordem das sementes: resultado reprodutível
+                for future in futures:
+                    accumulate(future.result())
+                if precise_enough():
+                    stopped_early = start + wave < len(chunks)
+                    break
+
+    summary = {}
+    for name, per_metric in stats.items():
+        summary[name] = {}
+        for m, s in per_metric.items():
+            half = s.half_width(confidence)
+            summary[name][m] = {
+                'mean': s.mean,
+                'std': s.std,
+                'ciLow': s.mean - half if math.isfinite(half) else None,
+                'ciHigh': s.mean + half if math.isfinite(half) else None,
+            }
+
+    return {
+        'replications': next(iter(stats.values()))[metric].n,
+        'stoppedEarly': stopped_early,
+        'confidence': confidence,
+        'strategies': summary,
+    }
+
+
+# --- Ponto de Entrada do Programa ---
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Replicações Monte Carlo das estratégias de escalonamento.")
+    parser.add_argument('--spec', help="Arquivo JSON com a especificação da carga.")
+    parser.add_argument('--strategies', help="Lista separada por vírgulas (padrão: todas).")
+    parser.add_argument('--replications', type=int, default=1000)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--workers', type=int, default=None, help="Processos do pool (1 = sem pool).")
+    parser.add_argument('--ci-width', type=float, default=None, help="Para quando o IC ficar mais estreito que isto.")
+    parser.add_argument('--metric', default='avg_wt', choices=METRICS)
+    parser.add_argument('--confidence', type=float, default=0.95)
+    parser.add_argument('--config', default="config.txt")
+    args = parser.parse_args()
+
+    simulator = SchedulerSimulator()
+    simulator.load_config(args.config)
+    spec = {}
+    if args.spec:
+        with open(args.spec, 'r') as f:
+            spec = json.load(f)
+    strategies = args.strategies.split(',') if args.strategies else list(simulator.strategies)
+
+    try:
+        result = run_replications(spec, strategies, args.replications, simulator.config,
+                                  seed=args.seed, workers=args.workers, ci_width=args.ci_width,
+                                  metric=args.metric, confidence=args.confidence)
+    except ValueError as e:
+        print(f"Erro: {e}", file=sys.stderr)
+        sys.exit(1)
+
+    print(f"Replicações executadas: {result['replications']}"
+          + (" (parada antecipada)" if result['stoppedEarly'] else ""))
+    print(f"Intervalos de confiança de {args.confidence:.0%}:")
+    for name, per_metric in result['strategies'].items():
+        print(f"\n--- {name} ---")
+        for m, s in per_metric.items():
+            if s['ciLow'] is None:
+                print(f"{m}: {s['mean']:.3f}")
+            else:
+                print(f"{m}: {s['mean']:.3f}  [{s['ciLow']:.3f}, {s['ciHigh']:.3f}]")
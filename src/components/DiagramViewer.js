@@ -78,6 +78,7 @@ const DiagramViewer = ({ diagramData, isLoading, inputProcesses, onAlgorithmChan
     switch (state) {
       case 'running': return 'Executando';
       case 'waiting': return 'Esperando';
+      case 'blocked': return 'Bloqueado (E/S)';
       case 'completed': return 'Concluído';
       case 'idle': return 'Ocioso';
       default: return 'Desconhecido';
@@ -169,6 +170,7 @@ const DiagramViewer = ({ diagramData, isLoading, inputProcesses, onAlgorithmChan
                     >
                       {state === 'running' && '##'}
                       {state === 'waiting' && '--'}
+                      {state === 'blocked' && 'IO'}
                       {state === 'idle' && '  '}
                       {state === 'completed' && '✓'}
                     </div>
@@ -191,6 +193,10 @@ const DiagramViewer = ({ diagramData, isLoading, inputProcesses, onAlgorithmChan
             <div className="legend-color" style={{ backgroundColor: '#f59e0b' }}></div>
             <span>Esperando (--)</span>
           </div>
+          <div className="legend-item">
+            <div className="legend-color" style={{ backgroundColor: '#3b82f6' }}></div>
+            <span>Bloqueado em E/S (IO)</span>
+          </div>
           <div className="legend-item">
             <div className="legend-color" style={{ backgroundColor: '#6b7280' }}></div>
             <span>Concluído (✓)</span>
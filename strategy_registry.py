@@ -0,0 +1,222 @@
+#!/usr/bin/env python3
+
+import os
+import sys
+import importlib
+import importlib.util
+from collections.abc import Mapping
+
+"""
+Registro de estratégias de escalonamento carregadas sob demanda.
+
+Fontes, nesta ordem (um id repetido fica com a primeira):
+1. as estratégias embutidas, declaradas em SchedulerNoGUI;
+2. entry points do grupo 'scheduler.strategies' de pacotes instalados
+   (nome = id, valor = 'modulo:Classe');
+3. arquivos .py nos diretórios de plugins (SCHEDULER_PLUGIN_DIR, separados
+   por os.pathsep; padrão: ./plugins ao lado deste arquivo).
+
+Os metadados de um plugin ficam num dict literal no próprio módulo, lido
+com ast sem executar o arquivo, por exemplo:
+
+    STRATEGY = {'id': 'MLFQ', 'class': 'MLFQStrategy', 'name': 'Multilevel Feedback Queue',
+                'description': '...', 'preemptive': True, 'needsQuantum': True}
+
+Listar estratégias não importa nenhum plugin; só a escolhida é importada
+e instanciada, na primeira vez em que é usada.
+"""
+
+ENTRY_POINT_GROUP = 'scheduler.strategies'
+PLUGIN_DIRS = os.environ.get(
+    'SCHEDULER_PLUGIN_DIR', os.path.join(os.path.dirname(os.path.abspath(__file__)), 'plugins')
+).split(os.pathsep)
+METADATA_NAME = 'STRATEGY'
+
+
+class StrategySpec:
+    """Metadados de uma estratégia e onde encontrá-la (sem importá-la)."""
+    def __init__(self, id, target, name=None, description='', preemptive=False,
+                 needs_quantum=False, needs_aging=False):
+        self.id = id
+        # Classe, 'modulo:Classe' ou (caminho do arquivo .py, 'Classe')
+        self.target = target
+        self.name = name or id
+        self.description = description
+        self.preemptive = preemptive
+        self.needs_quantum = needs_quantum
+        self.needs_aging = needs_aging
+
+    @classmethod
+    def from_metadata(cls, metadata, target):
+        return cls(
+            metadata.get('id'), target,
+            name=metadata.get('name'),
+            description=metadata.get('description', ''),
+            preemptive=bool(metadata.get('preemptive', False)),
+            needs_quantum=bool(metadata.get('needsQuantum', False)),
+            needs_aging=bool(metadata.get('needsAging', False)),
+        )
+
+    def load(self):
+        """Importa e retorna a classe da estratégia."""
+        if isinstance(self.target, type):
+            return self.target
+        if isinstance(self.target, tuple):
+            path, attr = self.target
+            module = _load_file(path)
+        else:
+            module_name, _, attr = self.target.partition(':')
+            module = importlib.import_module(module_name)
+        return getattr(module, attr)
+
+    def to_dict(self):
+        """Formato de /api/algorithms."""
+        info = {
+            'id': self.id,
+            'name': self.name,
+            'description': self.description,
+            'preemptive': self.preemptive,
+        }
+        if self.needs_quantum:
+            info['needsQuantum'] = True
+        if self.needs_aging:
+            info['needsAging'] = True
+        return info
+
+
+def _warn(message):
+    print(f"Aviso (plugins): {message}", file=sys.stderr)
+
+
+def _load_file(path):
+    """Importa um arquivo de plugin como módulo (uma única vez)."""
+    module_name = f"scheduler_plugin_{os.path.splitext(os.path.basename(path))[0]}"
+    module = sys.modules.get(module_name)
+    if module is None:
+        spec = importlib.util.spec_from_file_location(module_name, path)
+        module = importlib.util.module_from_spec(spec)
+        sys.modules[module_name] = module
+        try:
+            spec.loader.exec_module(module)
+        except BaseException:
+            del sys.modules[module_name]
+            raise
+    return module
+
+
+def read_metadata(path):
+    """Lê o dict STRATEGY de um arquivo-fonte sem executá-lo (None se ausente ou ilegível)."""
+    import ast  # Só necessário ao varrer plugins
+    try:
+        with open(path, 'rb') as f:
+            tree = ast.parse(f.read(), filename=path)
+    except (OSError, SyntaxError, ValueError):
+        return None
+    for node in tree.body:
+        if (isinstance(node, ast.Assign) and len(node.targets) == 1
+                and isinstance(node.targets[0], ast.Name) and node.targets[0].id == METADATA_NAME):
+            try:
+                metadata = ast.literal_eval(node.value)
+            except ValueError:
+                break
+            return metadata if isinstance(metadata, dict) else None
+    return None
+
+
+def discover_directory(directory):
+    """Especificações dos plugins .py de um diretório (sem importá-los)."""
+    if not os.path.isdir(directory):
+        return []
+    specs = []
+    for filename in sorted(os.listdir(directory)):
+        if not filename.endswith('.py') or filename.startswith('_'):
+            continue
+        path = os.path.join(directory, filename)
+        metadata = read_metadata(path)
+        if not metadata or 'id' not in metadata or 'class' not in metadata:
+            _warn(f"'{path}' ilegível ou sem {METADATA_NAME} com 'id' e 'class'; ignorado")
+            continue
+        specs.append(StrategySpec.from_metadata(metadata, (path, metadata['class'])))
+    return specs
+
+
+def discover_entry_points(group=ENTRY_POINT_GROUP):
+    """Especificações dos entry points do grupo (lê só o fonte dos módulos)."""
+    from importlib.metadata import entry_points  # Custa alguns ms: só quando preciso
+    try:
+        found = entry_points(group=group)
+    except TypeError:
+        found = entry_points().get(group, [])  # Python < 3.10
+    specs = []
+    for entry_point in found:
+        module_name = entry_point.value.partition(':')[0].strip()
+        metadata = {}
+        try:
+            module_spec = importlib.util.find_spec(module_name)
+        except (ImportError, ValueError):
+            module_spec = None
+        if module_spec is not None and module_spec.origin and module_spec.origin.endswith('.py'):
+            metadata = read_metadata(module_spec.origin) or {}
+        metadata = {**metadata, 'id': entry_point.name}
+        specs.append(StrategySpec.from_metadata(metadata, entry_point.value))
+    return specs
+
+
+class StrategyRegistry(Mapping):
+    """
+    Mapeia id -> instância da estratégia, criada no primeiro acesso. Entry
+    points e diretórios de plugins só são varridos quando um id não é
+    embutido ou quando a lista completa é pedida.
+    """
+    def __init__(self, builtin=(), plugin_dirs=None, entry_point_group=ENTRY_POINT_GROUP):
+        self._builtin = {spec.id: spec for spec in builtin}
+        self._plugin_dirs = PLUGIN_DIRS if plugin_dirs is None else plugin_dirs
+        self._entry_point_group = entry_point_group
+        self._plugins = None
+        self._instances = {}
+
+    def _discovered(self):
+        if self._plugins is None:
+            plugins = {}
+            sources = []
+            if self._entry_point_group:
+                sources.append(discover_entry_points(self._entry_point_group))
+            sources.extend(discover_directory(d) for d in self._plugin_dirs if d)
+            for specs in sources:
+                for spec in specs:
+                    if spec.id in self._builtin or spec.id in plugins:
+                        _warn(f"estratégia '{spec.id}' já registrada; ignorando a duplicata")
+                        continue
+                    plugins[spec.id] = spec
+            self._plugins = plugins
+        return self._plugins
+
+    def spec(self, name):
+        """Metadados da estratégia (KeyError se desconhecida)."""
+        if name in self._builtin:
+            return self._builtin[name]
+        return self._discovered()[name]
+
+    def specs(self):
+        return list(self._builtin.values()) + list(self._discovered().values())
+
+    def describe(self):
+        """Lista de metadados de todas as estratégias, sem importar plugins."""
+        return [spec.to_dict() for spec in self.specs()]
+
+    def __getitem__(self, name):
+        instance = self._instances.get(name)
+        if instance is None:
+            instance = self._instances[name] = self.spec(name).load()()
+        return instance
+
+    def __contains__(self, name):
+        if not isinstance(name, str):
+            return False  # Ex: valores arbitrários vindos do JSON da requisição
+        return name in self._builtin or name in self._discovered()
+
+    def __iter__(self):
+        return iter([spec.id for spec in self.specs()])
+
+    def __len__(self):
+        return len(self._builtin) + len(self._discovered())
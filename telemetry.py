@@ -0,0 +1,183 @@
+#!/usr/bin/env python3
+
+import os
+import sys
+import time
+import threading
+
+"""
+Métricas em memória, no formato texto do Prometheus (exposition 0.0.4),
+sem dependências externas. Cada métrica guarda um valor por combinação de
+rótulos; a atualização é só um dict e uma trava, barata o bastante para
+rodar a cada requisição.
+"""
+
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+# Baldes padrão de latência (segundos)
+LATENCY_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)
+
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _format_labels(names, values, extra=()):
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    pairs.extend(f'{name}="{value}"' for name, value in extra)
+    return '{' + ','.join(pairs) + '}' if pairs else ''
+
+
+def _format_value(value):
+    if value == float('inf'):
+        return '+Inf'
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return repr(value) if isinstance(value, float) else str(value)
+
+
+class _Metric:
+    """
+    Base das métricas. Com 'collect', o valor é lido na hora da coleta: a
+    função retorna um número ou um dict {tupla de rótulos: número} (None =
+    omitir), útil para o que já é contado em outro lugar (ex: filas).
+    """
+    kind = None
+
+    def __init__(self, name, documentation, labels=(), collect=None):
+        self.name = name
+        self.documentation = documentation
+        self.labels = tuple(labels)
+        self.collect = collect
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def _key(self, labels):
+        return tuple(str(labels.get(name, '')) for name in self.labels)
+
+    def samples(self):
+        """Linhas (nome, rótulos formatados, valor) para exposição."""
+        if self.collect is not None:
+            values = self.collect()
+            if values is None:
+                return []
+            values = values.items() if isinstance(values, dict) else [((), values)]
+        else:
+            with self._lock:
+                values = list(self._values.items())
+        return [(self.name, _format_labels(self.labels, key), value)
+                for key, value in sorted(values) if value is not None]
+
+    def render(self):
+        lines = [f'# HELP {self.name} {self.documentation}', f'# TYPE {self.name} {self.kind}']
+        lines.extend(f'{name}{labels} {_format_value(value)}' for name, labels, value in self.samples())
+        return lines
+
+
+class Counter(_Metric):
+    """Valor que só cresce (ex: total de requisições)."""
+    kind = 'counter'
+
+    def inc(self, amount=1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+
+class Gauge(_Metric):
+    """Valor instantâneo (ex: tamanho de uma fila)."""
+    kind = 'gauge'
+
+    def set(self, value, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = value
+
+
+class Histogram(_Metric):
+    """Distribuição em baldes cumulativos, com soma e contagem."""
+    kind = 'histogram'
+
+    def __init__(self, name, documentation, labels=(), buckets=LATENCY_BUCKETS):
+        super().__init__(name, documentation, labels)
+        self.buckets = tuple(sorted(buckets)) + (float('inf'),)
+
+    def observe(self, value, **labels):
+        key = self._key(labels)
+        with self._lock:
+            state = self._values.get(key)
+            if state is None:
+                state = self._values[key] = [[0] * len(self.buckets), 0.0, 0]
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    state[0][i] += 1
+                    break
+            state[1] += value
+            state[2] += 1
+
+    def samples(self):
+        with self._lock:
+            values = [(key, (list(counts), total, count)) for key, (counts, total, count) in self._values.items()]
+        samples = []
+        for key, (counts, total, count) in sorted(values):
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets, counts):
+                cumulative += bucket_count
+                samples.append((f'{self.name}_bucket',
+                                _format_labels(self.labels, key, [('le', _format_value(float(bound)))]),
+                                cumulative))
+            labels = _format_labels(self.labels, key)
+            samples.append((f'{self.name}_sum', labels, total))
+            samples.append((f'{self.name}_count', labels, count))
+        return samples
+
+
+class Registry:
+    """Conjunto de métricas exposto por um endpoint."""
+    def __init__(self):
+        self._metrics = []
+
+    def register(self, metric):
+        self._metrics.append(metric)
+        return metric
+
+    def counter(self, *args, **kwargs):
+        return self.register(Counter(*args, **kwargs))
+
+    def gauge(self, *args, **kwargs):
+        return self.register(Gauge(*args, **kwargs))
+
+    def histogram(self, *args, **kwargs):
+        return self.register(Histogram(*args, **kwargs))
+
+    def render(self):
+        lines = []
+        for metric in self._metrics:
+            lines.extend(metric.render())
+        return '\n'.join(lines) + '\n'
+
+
+def rss_bytes():
+    """Memória residente do processo (bytes), ou None se indisponível."""
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, AttributeError):
+        pass
+    try:
+        import resource
+    except ImportError:
+        return None  # Windows
+    # Sem /proc (ex: macOS) só há o pico; ru_maxrss vem em KiB no Linux
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return rss if sys.platform == 'darwin' else rss * 1024
+
+
+def process_metrics(registry):
+    """Registra as métricas padrão do processo (RSS, CPU, início)."""
+    start_time = time.time()
+    registry.gauge('process_resident_memory_bytes', 'Memória residente em bytes.', collect=rss_bytes)
+    registry.counter('process_cpu_seconds_total', 'Tempo de CPU do processo em segundos.',
+                     collect=time.process_time)
+    registry.gauge('process_start_time_seconds', 'Início do processo (época Unix, segundos).',
+                   collect=lambda: start_time)
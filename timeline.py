@@ -0,0 +1,210 @@
+#!/usr/bin/env python3
+
+import uuid
+import threading
+from array import array
+from bisect import bisect_right
+from itertools import groupby
+from collections import OrderedDict
+
+"""
+Índice de linhas do tempo para consultas por janela (viewport).
+Cada processo é guardado como sequência de trechos (runs) de mesmo estado,
+com busca binária pelo início da janela. Para visões afastadas há uma
+pirâmide de níveis de detalhe (LOD) com o estado dominante de cada balde,
+de modo que toda resposta tem tamanho limitado, qualquer que seja o makespan.
+"""
+
+# Códigos inteiros dos estados (mesmos nomes usados em diagramData)
+STATES = ('idle', 'running', 'waiting', 'blocked', 'completed')
+_SYMBOL_CODES = {'##': 1, '--': 2, 'IO': 3, '✓': 4}
+
+# Baldes menores que 2**LOD_BASE_LEVEL são agregados na hora, a partir
+# dos trechos; a pirâmide pré-calculada começa nesse nível.
+LOD_BASE_LEVEL = 4
+DEFAULT_MAX_POINTS = 500
+
+
+def _dominant(counts):
+    """Estado com mais unidades de tempo no balde (empate: menor código)."""
+    best = 0
+    for code in range(1, len(counts)):
+        if counts[code] > counts[best]:
+            best = code
+    return best
+
+
+class ProcessTimeline:
+    """Linha do tempo de um processo em trechos + pirâmide de LOD."""
+    def __init__(self, pid, symbols):
+        self.pid = pid
+        self.length = len(symbols)
+        self.starts = array('q')
+        self.codes = array('b')
+        t = 0
+        for symbol, group in groupby(symbols):
+            code = _SYMBOL_CODES.get(symbol, 0)
+            if self.codes and self.codes[-1] == code:
+                t += sum(1 for _ in group)  # Símbolos distintos, mesmo estado
+                continue
+            self.starts.append(t)
+            self.codes.append(code)
+            t += sum(1 for _ in group)
+        self.levels = {}
+        self._build_levels()
+
+    def _build_levels(self):
+        """
+        Pré-calcula a pirâmide: contagens por estado no nível base, a partir
+        dos trechos; cada nível seguinte soma os pares de baldes do anterior.
+        """
+        size = 1 << LOD_BASE_LEVEL
+        if size >= self.length * 2:
+            return
+        n_buckets = -(-self.length // size)
+        counts = [array('q', bytes(8 * n_buckets)) for _ in STATES]
+        for run, start in enumerate(self.starts):
+            end = self.starts[run + 1] if run + 1 < len(self.starts) else self.length
+            state_counts = counts[self.codes[run]]
+            while start < end:
+                bucket = start // size
+                bucket_end = min((bucket + 1) * size, end)
+                state_counts[bucket] += bucket_end - start
+                start = bucket_end
+
+        level = LOD_BASE_LEVEL
+        while True:
+            self.levels[level] = array('b', (
+                _dominant([c[i] for c in counts]) for i in range(n_buckets)
+            ))
+            if (1 << level) >= self.length:
+                break
+            n_buckets = -(-n_buckets // 2)
+            counts = [
+                array('q', (c[2 * i] + (c[2 * i + 1] if 2 * i + 1 < len(c) else 0) for i in range(n_buckets)))
+                for c in counts
+            ]
+            level += 1
+
+    def _aggregate(self, level, first_bucket, last_bucket):
+        """Estado dominante de cada balde de 2**level unidades no intervalo."""
+        size = 1 << level
+        result = array('b')
+        run = max(0, bisect_right(self.starts, first_bucket * size) - 1)
+        for bucket in range(first_bucket, last_bucket):
+            lo, hi = bucket * size, min((bucket + 1) * size, self.length)
+            counts = [0] * len(STATES)
+            while run < len(self.starts) and self.starts[run] < hi:
+                run_end = self.starts[run + 1] if run + 1 < len(self.starts) else self.length
+                overlap = min(run_end, hi) - max(self.starts[run], lo)
+                if overlap > 0:
+                    counts[self.codes[run]] += overlap
+                if run_end > hi:
+                    break  # O trecho continua no próximo balde
+                run += 1
+            result.append(_dominant(counts))
+        return result
+
+    def runs(self):
+        """Trechos como lista plana [código, duração, código, duração, ...]."""
+        flat = []
+        for run, start in enumerate(self.starts):
+            end = self.starts[run + 1] if run + 1 < len(self.starts) else self.length
+            flat.extend((self.codes[run], end - start))
+        return flat
+
+    def window(self, level, first_bucket, last_bucket):
+        """Códigos dos baldes [first_bucket, last_bucket) no nível pedido."""
+        last_bucket = min(last_bucket, -(-self.length >> level))
+        if first_bucket >= last_bucket:
+            return []
+        if level in self.levels:
+            return list(self.levels[level][first_bucket:last_bucket])
+        if level == 0:
+            # Nível de unidade: expande os trechos da janela
+            codes = []
+            run = max(0, bisect_right(self.starts, first_bucket) - 1)
+            t = first_bucket
+            while t < last_bucket:
+                run_end = self.starts[run + 1] if run + 1 < len(self.starts) else self.length
+                end = min(run_end, last_bucket)
+                codes.extend([self.codes[run]] * (end - t))
+                t = end
+                run += 1
+            return codes
+        return list(self._aggregate(level, first_bucket, last_bucket))
+
+
+class TimelineIndex:
+    """Índice de todos os processos de um resultado de simulação."""
+    def __init__(self, diagram_data, pids):
+        self.pids = list(pids)
+        self.timelines = {pid: ProcessTimeline(pid, diagram_data.get(pid, [])) for pid in self.pids}
+        self.max_time = max((t.length for t in self.timelines.values()), default=0)
+
+    def query(self, start=0, end=None, pids=None, max_points=DEFAULT_MAX_POINTS):
+        """
+        Retorna a janela [start, end) dos processos pedidos, com no máximo
+        'max_points' baldes por processo, no formato de diagramData.
+        """
+        end = self.max_time if end is None else min(int(end), self.max_time)
+        start = max(0, min(int(start), end))
+        max_points = max(1, int(max_points))
+        pids = [pid for pid in (pids or self.pids) if pid in self.timelines]
+
+        # Menor nível cujo número de baldes na janela cabe em max_points
+        level = 0
+        while -(-end // (1 << level)) - start // (1 << level) > max_points:
+            level += 1
+        first_bucket = start >> level
+        last_bucket = -(-end >> level)
+
+        return {
+            'start': first_bucket << level,
+            'end': min(last_bucket << level, self.max_time),
+            'bucketSize': 1 << level,
+            'maxTime': self.max_time,
+            'processes': [
+                {
+                    'id': pid,
+                    'timeline': [STATES[c] for c in self.timelines[pid].window(level, first_bucket, last_bucket)]
+                }
+                for pid in pids
+            ]
+        }
+
+
+    def runs(self):
+        """Linha do tempo completa codificada em trechos (RLE) por processo."""
+        return {
+            'states': list(STATES),
+            'maxTime': self.max_time,
+            'processes': [{'id': pid, 'runs': self.timelines[pid].runs()} for pid in self.pids]
+        }
+
+
+class ResultStore:
+    """Resultados recentes (índices de linha do tempo) em LRU, por processo."""
+    def __init__(self, capacity=64):
+        self.capacity = capacity
+        self._results = OrderedDict()
+        self._lock = threading.Lock()
+
+    def put(self, index):
+        result_id = uuid.uuid4().hex
+        with self._lock:
+            self._results[result_id] = index
+            while len(self._results) > self.capacity:
+                self._results.popitem(last=False)
+        return result_id
+
+    def get(self, result_id):
+        """Retorna o índice ou None se ele não existe (ou já foi descartado)."""
+        with self._lock:
+            index = self._results.get(result_id)
+            if index is not None:
+                self._results.move_to_end(result_id)
+            return index
+
+    def __len__(self):
+        return len(self._results)
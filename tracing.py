@@ -0,0 +1,369 @@
+#!/usr/bin/env python3
+
+import sys
+import gzip
+import json
+import random
+import argparse
+
+from SchedulerNoGUI import SchedulerSimulator, SimulationRun, Process, AGING
+
+"""
+Traces determinísticos de escalonamento: gravação, reexecução e diff.
+
+Um trace é a sequência de eventos de ocupação da CPU de uma execução de
+schedule(): (instante, tipo, id[, valor]), com os tipos D (despacho),
+P (preempção), B (bloqueio para E/S), C (término) e A (envelhecimento,
+com a nova prioridade). O arquivo é texto, um evento por linha, precedido
+por um cabeçalho '#trace {json}' com a estratégia, a configuração, a carga
+e as métricas; termina em .gz para ser comprimido. Um arquivo pode conter
+vários traces.
+
+Uso:
+  python tracing.py record SJF -o sjf.trace < processos.txt
+  python tracing.py replay sjf.trace          # código atual vs trace gravado
+  python tracing.py diff a.trace b.trace
+  python tracing.py suite --golden golden.trace.gz [--update]
+"""
+
+FORMAT_VERSION = 1
+HEADER_PREFIX = '#trace '
+CONTEXT_EVENTS = 5  # Eventos em comum exibidos antes da divergência
+
+
+class TraceDivergence(Exception):
+    """Lançada na reexecução assim que um evento difere do esperado."""
+    def __init__(self, index, expected, got):
+        super().__init__(f"Divergência no evento #{index}")
+        self.index = index
+        self.expected = expected
+        self.got = got
+
+
+class ExpectedTrace(list):
+    """
+    Destino de eventos que compara cada um com o trace esperado, para a
+    reexecução parar na primeira divergência em vez de simular até o fim.
+    """
+    def __init__(self, expected):
+        super().__init__()
+        self.expected = expected
+
+    def append(self, event):
+        index = len(self)
+        expected = self.expected[index] if index < len(self.expected) else None
+        if tuple(event) != expected:
+            raise TraceDivergence(index, expected, tuple(event))
+        super().append(event)
+
+
+def format_event(event):
+    return ' '.join(str(field) for field in event)
+
+
+def parse_event(line):
+    fields = line.split()
+    event = (int(fields[0]), fields[1], fields[2])
+    if fields[1] == AGING:
+        event += (int(fields[3]),)
+    return event
+
+
+def encode_processes(processes):
+    """Carga como lista JSON: [id, criação, prioridade, bilhetes, rajadas]."""
+    return [[p.id, p.creation_time, p.static_priority, p.tickets, p.bursts] for p in processes]
+
+
+def decode_processes(workload):
+    processes = []
+    for pid, creation, priority, tickets, bursts in workload:
+        processes.append(Process(pid, creation, bursts[0], priority, tickets=tickets,
+                                 bursts=bursts if len(bursts) > 1 else None))
+    return processes
+
+
+def record(algorithm, processes, config, simulator=None, diagram=False):
+    """Executa a estratégia gravando o trace. Retorna o registro (dict)."""
+    simulator = simulator or SchedulerSimulator()
+    events = []
+    run = SimulationRun(diagram=diagram, trace=events)
+    processes_copy = [p.clone() for p in processes]
+    avg_tt, avg_wt, context_switches, _ = simulator.strategies[algorithm].schedule(processes_copy, config, run)
+    return {
+        'version': FORMAT_VERSION,
+        'algorithm': algorithm,
+        'config': dict(config),
+        'workload': encode_processes(processes),
+        'summary': {
+            'avgTurnaroundTime': avg_tt,
+            'avgWaitingTime': avg_wt,
+            'contextSwitches': context_switches,
+            'makespan': run.makespan,
+        },
+        'events': events,
+    }
+
+
+def first_divergence(expected, got):
+    """Índice do primeiro evento diferente (None se os traces são iguais)."""
+    for index, (a, b) in enumerate(zip(expected, got)):
+        if tuple(a) != tuple(b):
+            return index
+    if len(expected) != len(got):
+        return min(len(expected), len(got))
+    return None
+
+
+def replay(trace, algorithm=None, simulator=None):
+    """
+    Reexecuta a carga do trace com o código atual (e a mesma estratégia,
+    ou outra) parando na primeira divergência. Retorna None se o trace se
+    repetiu, ou (índice, evento esperado, evento obtido); None no lugar de
+    um evento significa que o trace correspondente acabou antes.
+    """
+    simulator = simulator or SchedulerSimulator()
+    expected = [tuple(event) for event in trace['events']]
+    sink = ExpectedTrace(expected)
+    run = SimulationRun(diagram=False, trace=sink)
+    try:
+        simulator.strategies[algorithm or trace['algorithm']].schedule(
+            decode_processes(trace['workload']), trace['config'], run)
+    except TraceDivergence as divergence:
+        return divergence.index, divergence.expected, divergence.got
+    if len(sink) < len(expected):
+        return len(sink), expected[len(sink)], None
+    return None
+
+
+def _open(path, mode):
+    if path == '-':
+        return sys.stdout if 'w' in mode else sys.stdin
+    if path.endswith('.gz'):
+        return gzip.open(path, mode + 't', encoding='utf-8')
+    return open(path, mode, encoding='utf-8')
+
+
+def write_traces(path, traces):
+    f = _open(path, 'w')
+    try:
+        for trace in traces:
+            header = {k: v for k, v in trace.items() if k != 'events'}
+            f.write(HEADER_PREFIX + json.dumps(header, sort_keys=True, separators=(',', ':')) + '\n')
+            for event in trace['events']:
+                f.write(format_event(event) + '\n')
+    finally:
+        if f is not sys.stdout:
+            f.close()
+
+
+def read_traces(path):
+    """Lê todos os traces de um arquivo (lista de dicts com 'events')."""
+    traces = []
+    f = _open(path, 'r')
+    try:
+        for line in f:
+            if line.startswith(HEADER_PREFIX):
+                trace = json.loads(line[len(HEADER_PREFIX):])
+                trace['events'] = []
+                traces.append(trace)
+            elif line.strip():
+                if not traces:
+                    raise ValueError(f"'{path}' não começa com um cabeçalho de trace.")
+                traces[-1]['events'].append(parse_event(line))
+    finally:
+        if f is not sys.stdin:
+            f.close()
+    return traces
+
+
+def describe_divergence(index, expected, got, common):
+    """Texto da divergência com os últimos eventos em comum como contexto."""
+    lines = [f"Primeira divergência no evento #{index}:"]
+    for event in common[max(0, index - CONTEXT_EVENTS):index]:
+        lines.append(f"    {format_event(event)}")
+    lines.append(f"  esperado: {format_event(expected) if expected else '(fim do trace)'}")
+    lines.append(f"  obtido:   {format_event(got) if got else '(fim do trace)'}")
+    return '\n'.join(lines)
+
+
+# --- Suíte de traces de referência (golden) ---
+
+def suite_workloads(count, seed=0):
+    """
+    Cargas pequenas e determinísticas, com muitos empates (chegadas,
+    durações e prioridades repetidas) para exercitar o desempate. Só as
+    de índice ímpar têm E/S.
+    """
+    rng = random.Random(seed)
+    workloads = []
+    for i in range(count):
+        processes = []
+        for k in range(rng.randint(1, 12)):
+            bursts = None
+            if i % 2 and rng.random() < 0.5:
+                bursts = [rng.randint(1, 6) for _ in range(rng.choice((3, 5)))]
+            duration = bursts[0] if bursts else rng.randint(1, 8)
+            processes.append(Process(f"P{k+1}", rng.randint(0, 20), duration, rng.randint(0, 4), bursts=bursts))
+        workloads.append(processes)
+    return workloads
+
+
+# quantum 0: nunca estoura (RR vira FCFS)
+SUITE_CONFIGS = ({'quantum': 1, 'aging': 1}, {'quantum': 2, 'aging': 1}, {'quantum': 3, 'aging': 2},
+                 {'quantum': 0, 'aging': 1})
+
+
+def _load_batch_engine():
+    try:
+        import batch_engine
+        return batch_engine
+    except ImportError:
+        return None
+
+
+def run_suite(count=100, seed=0, golden=None, update=False, out=sys.stdout):
+    """
+    Compara os motores otimizados com o loop de referência, evento a
+    evento: o modo só-métricas (diagram=False) e o motor vetorizado (se
+    houver NumPy, nas cargas só de CPU). Com 'golden', compara também o
+    código atual com os traces gravados (ou os regrava, com update=True).
+    Retorna o número de falhas.
+    """
+    simulator = SchedulerSimulator()
+    workloads = suite_workloads(count, seed)
+    failures = 0
+
+    def fail(label, index, expected, got, common):
+        nonlocal failures
+        failures += 1
+        if failures <= 10:
+            print(f"FALHA {label}\n{describe_divergence(index, expected, got, common)}", file=out)
+
+    # Referência: loop com diagrama, todas as estratégias e configurações
+    reference = {}
+    for algorithm in simulator.strategies:
+        for c, config in enumerate(SUITE_CONFIGS):
+            for w, processes in enumerate(workloads):
+                reference[algorithm, c, w] = record(algorithm, processes, config, simulator, diagram=True)
+
+    # 1. Modo só-métricas
+    checked = 0
+    for (algorithm, c, w), trace in reference.items():
+        got = record(algorithm, workloads[w], SUITE_CONFIGS[c], simulator)['events']
+        index = first_divergence(trace['events'], got)
+        checked += 1
+        if index is not None:
+            fail(f"metrics-only {algorithm} config={SUITE_CONFIGS[c]} carga={w}", index,
+                 _at(trace['events'], index), _at(got, index), trace['events'])
+    print(f"metrics-only: {checked} traces comparados", file=out)
+
+    # 2. Motor vetorizado (só cargas sem E/S)
+    engine = _load_batch_engine()
+    if engine is None:
+        print("vectorized: ignorado (NumPy indisponível)", file=out)
+    else:
+        checked = 0
+        cpu_only = [w for w, processes in enumerate(workloads) if all(len(p.bursts) == 1 for p in processes)]
+        tuples = [[(p.creation_time, p.duration, p.static_priority) for p in workloads[w]] for w in cpu_only]
+        for algorithm in engine.SUPPORTED:
+            for c, config in enumerate(SUITE_CONFIGS):
+                traces = engine.simulate_batch(tuples, algorithm, config, trace=True)['traces']
+                for w, got in zip(cpu_only, traces):
+                    expected = reference[algorithm, c, w]['events']
+                    index = first_divergence(expected, got)
+                    checked += 1
+                    if index is not None:
+                        fail(f"vectorized {algorithm} config={config} carga={w}", index,
+                             _at(expected, index), _at(got, index), expected)
+        print(f"vectorized: {checked} traces comparados", file=out)
+
+    # 3. Traces gravados (detecta mudanças no próprio loop de referência)
+    if golden:
+        if update:
+            write_traces(golden, reference.values())
+            print(f"golden: {len(reference)} traces gravados em {golden}", file=out)
+        else:
+            stored = read_traces(golden)
+            for trace in stored:
+                divergence = replay(trace, simulator=simulator)
+                if divergence is not None:
+                    fail(f"golden {trace['algorithm']} config={trace['config']}", *divergence, trace['events'])
+            print(f"golden: {len(stored)} traces reexecutados", file=out)
+
+    print("OK" if not failures else f"{failures} falha(s)", file=out)
+    return failures
+
+
+def _at(events, index):
+    return tuple(events[index]) if index < len(events) else None
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Gravação, reexecução e diff de traces de escalonamento.")
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    rec = commands.add_parser('record', help="Grava o trace de uma estratégia (processos via stdin).")
+    rec.add_argument('algorithm')
+    rec.add_argument('-o', '--output', default='-', help="Arquivo de saída (.gz comprime; padrão: stdout).")
+    rec.add_argument('--config', default='config.txt', help="Arquivo de configuração (quantum/aging).")
+    rec.add_argument('--seed', type=int, help="Semente do Lottery.")
+
+    rep = commands.add_parser('replay', help="Reexecuta os traces de um arquivo com o código atual.")
+    rep.add_argument('trace')
+    rep.add_argument('--algorithm', help="Compara com outra estratégia, na mesma carga.")
+
+    dif = commands.add_parser('diff', help="Primeira divergência entre dois arquivos de trace.")
+    dif.add_argument('expected')
+    dif.add_argument('got')
+
+    sui = commands.add_parser('suite', help="Compara os motores otimizados com o loop de referência.")
+    sui.add_argument('--workloads', type=int, default=100)
+    sui.add_argument('--seed', type=int, default=0)
+    sui.add_argument('--golden', help="Arquivo de traces de referência.")
+    sui.add_argument('--update', action='store_true', help="Regrava o arquivo --golden.")
+
+    args = parser.parse_args()
+    simulator = SchedulerSimulator()
+
+    if args.command == 'record':
+        if args.algorithm not in simulator.strategies:
+            parser.error(f"Estratégia '{args.algorithm}' desconhecida.")
+        simulator.load_config(args.config)
+        if args.seed is not None:
+            simulator.config['seed'] = args.seed
+        simulator.load_processes_from_stdin()
+        trace = record(args.algorithm, simulator.processes, simulator.config, simulator)
+        write_traces(args.output, [trace])
+        print(f"{len(trace['events'])} eventos gravados.", file=sys.stderr)
+        return 0
+
+    if args.command == 'replay':
+        divergent = 0
+        for i, trace in enumerate(read_traces(args.trace)):
+            divergence = replay(trace, args.algorithm, simulator)
+            if divergence is not None:
+                divergent += 1
+                print(f"Trace {i} ({trace['algorithm']}, {trace['config']}):")
+                print(describe_divergence(*divergence, trace['events']))
+        print("Nenhuma divergência." if not divergent else f"{divergent} trace(s) divergente(s).")
+        return 1 if divergent else 0
+
+    if args.command == 'diff':
+        expected, got = read_traces(args.expected), read_traces(args.got)
+        if len(expected) != len(got):
+            print(f"Quantidade de traces difere: {len(expected)} x {len(got)}")
+        divergent = 0
+        for i, (a, b) in enumerate(zip(expected, got)):
+            index = first_divergence(a['events'], b['events'])
+            if index is not None:
+                divergent += 1
+                print(f"Trace {i} ({a['algorithm']} x {b['algorithm']}):")
+                print(describe_divergence(index, _at(a['events'], index), _at(b['events'], index), a['events']))
+        print("Traces idênticos." if not divergent and len(expected) == len(got) else f"{divergent} trace(s) divergente(s).")
+        return 1 if divergent or len(expected) != len(got) else 0
+
+    return 1 if run_suite(args.workloads, args.seed, args.golden, args.update) else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,414 @@
+#!/usr/bin/env python3
+
+import sys
+import json
+import math
+import argparse
+
+from SchedulerNoGUI import SchedulerSimulator, SimulationRun
+
+"""
+Ajuste automático de 'quantum' e 'aging' (RoundRobin, RoundRobinPriority-
+Aging e demais estratégias que declaram needsQuantum/needsAging).
+
+Em vez de simular a carga inteira para cada combinação da grade, usa
+successive halving: todas as combinações são avaliadas num prefixo pequeno
+da carga (os primeiros processos a chegar, o que preserva a intensidade de
+chegada), só a melhor fração 1/eta segue para um prefixo eta vezes maior,
+e assim por diante até a carga completa. O custo total fica em poucas
+execuções completas, contra uma por combinação na busca exaustiva.
+
+O objetivo é minimizado (ex: p95 do tempo de espera) com um limite
+opcional de trocas de contexto; combinações que o violam ficam atrás de
+todas as que o respeitam, ordenadas pelo excesso.
+"""
+
+def percentile(values, q):
+    """Percentil pelo método do posto mais próximo (q em 0-100)."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(1, math.ceil(q / 100 * len(ordered)))
+    return float(ordered[rank - 1])
+
+def _mean(values):
+    return sum(values) / len(values) if values else 0.0
+
+# Objetivos: nome -> função(esperas, vidas) dos processos concluídos
+OBJECTIVES = {
+    'avg_wt': lambda waits, turnarounds: _mean(waits),
+    'p95_wt': lambda waits, turnarounds: percentile(waits, 95),
+    'p99_wt': lambda waits, turnarounds: percentile(waits, 99),
+    'max_wt': lambda waits, turnarounds: float(max(waits, default=0)),
+    'avg_tt': lambda waits, turnarounds: _mean(turnarounds),
+    'p95_tt': lambda waits, turnarounds: percentile(turnarounds, 95),
+}
+
+DEFAULT_OBJECTIVE = 'p95_wt'
+DEFAULT_ETA = 3
+# Menor prefixo avaliado (abaixo disso a ordenação fica ruidosa demais)
+MIN_PROCESSES = 64
+# Limite de valores por parâmetro na grade padrão
+MAX_GRID_VALUES = 16
+
+
+# --- Espaço de Busca ---
+
+def ladder(limit, dense=8, max_values=MAX_GRID_VALUES):
+    """
+    Valores inteiros de 1 a 'limit': todos até 'dense' e depois em
+    progressão geométrica (terminando em 'limit'), no máximo 'max_values'.
+    """
+    limit = max(1, int(limit))
+    values = list(range(1, min(limit, dense) + 1))
+    if limit > dense:
+        steps = max(1, max_values - len(values))
+        ratio = (limit / dense) ** (1 / steps)
+        value = float(dense)
+        while len(values) < max_values:
+            value *= ratio
+            if round(value) > values[-1]:
+                values.append(min(limit, round(value)))
+            if values[-1] >= limit:
+                break
+        if values[-1] != limit:
+            values[-1] = limit
+    return values
+
+def default_grid(spec, processes):
+    """
+    Grade padrão: quanta até a maior rajada de CPU (acima disso o RR não
+    muda mais) e aging de 0 a maior prioridade (acima disso satura).
+    """
+    quanta = [None]
+    agings = [None]
+    if spec.needs_quantum:
+        quanta = ladder(max(max(p.bursts[0::2]) for p in processes))
+    if spec.needs_aging:
+        agings = [0] + ladder(max(p.static_priority for p in processes))
+    return [(q, a) for q in quanta for a in agings]
+
+def build_grid(spec, processes, quanta=None, agings=None):
+    """Grade pedida (None = padrão para o parâmetro), sem repetições."""
+    grid = default_grid(spec, processes)
+    if quanta is not None and spec.needs_quantum:
+        quanta = sorted({int(q) for q in quanta})
+        if not quanta or quanta[0] < 1:
+            raise ValueError("Os valores de quantum devem ser inteiros >= 1.")
+    else:
+        quanta = sorted({q for q, _ in grid}, key=lambda v: (v is None, v))
+    if agings is not None and spec.needs_aging:
+        agings = sorted({int(a) for a in agings})
+        if not agings or agings[0] < 0:
+            raise ValueError("Os valores de aging devem ser inteiros >= 0.")
+    else:
+        agings = sorted({a for _, a in grid}, key=lambda v: (v is None, v))
+    return [(q, a) for q in quanta for a in agings]
+
+
+# --- Plano do Successive Halving ---
+
+def plan(grid_size, process_count, eta=DEFAULT_ETA, min_processes=MIN_PROCESSES):
+    """
+    Rodadas como lista de (processos do prefixo, candidatos avaliados).
+    A última rodada usa a carga inteira.
+    """
+    if eta < 2:
+        raise ValueError("eta deve ser >= 2.")
+    # Para com até eta finalistas, comparados na carga inteira
+    counts = [grid_size]
+    while counts[-1] > eta:
+        counts.append(math.ceil(counts[-1] / eta))
+    rungs = []
+    last = len(counts) - 1
+    for i, candidates in enumerate(counts):
+        size = min(process_count, max(min_processes, math.ceil(process_count / eta ** (last - i))))
+        # Rodadas com o mesmo prefixo (pelo mínimo de processos) viram uma só
+        if rungs and rungs[-1][0] == size:
+            continue
+        rungs.append((size, candidates))
+    return rungs
+
+def planned_work(rungs, process_count):
+    """Custo previsto do plano em execuções completas (aproximado por processos)."""
+    if process_count == 0:
+        return 0.0
+    return sum(candidates * size / process_count for size, candidates in rungs)
+
+def prefix(processes, size):
+    """Os 'size' primeiros processos a chegar (desempate pela ordem original)."""
+    order = sorted(range(len(processes)), key=lambda i: (processes[i].creation_time, i))
+    return [processes[i] for i in sorted(order[:size])]
+
+
+# --- Avaliação ---
+
+class _Progress:
+    """Progresso global (trabalho feito / previsto) repassado ao monitor do job."""
+    def __init__(self, monitor, total):
+        self.monitor = monitor
+        self.total = total or 1.0
+        self.done = 0.0
+        self.weight = 0.0
+        self.progress = 0.0
+
+    def __call__(self, run):
+        self.progress = min(1.0, (self.done + self.weight * run.progress) / self.total)
+        self.monitor(self)
+
+    def finish(self, weight):
+        self.done += weight
+        self.progress = min(1.0, self.done / self.total)
+        self.monitor(self)  # Também permite cancelar entre avaliações
+
+
+class Tuner:
+    """
+    Avalia combinações (quantum, aging) de uma estratégia sobre prefixos de
+    uma carga, guardando cada resultado por (combinação, prefixo).
+    """
+    def __init__(self, algorithm, processes, objective=DEFAULT_OBJECTIVE, max_switches=None,
+                 config=None, simulator=None, monitor=None):
+        self.simulator = simulator or SchedulerSimulator()
+        if algorithm not in self.simulator.strategies:
+            raise ValueError(f"Estratégia '{algorithm}' desconhecida.")
+        self.spec = self.simulator.strategies.spec(algorithm)
+        if not (self.spec.needs_quantum or self.spec.needs_aging):
+            raise ValueError(f"A estratégia '{algorithm}' não tem quantum nem aging para ajustar.")
+        if objective not in OBJECTIVES:
+            raise ValueError(f"Objetivo '{objective}' desconhecido. Disponíveis: {', '.join(OBJECTIVES)}")
+        if not processes:
+            raise ValueError("Nenhum processo fornecido.")
+        self.algorithm = algorithm
+        self.processes = processes
+        self.objective = objective
+        self.max_switches = max_switches
+        self.config = dict(config or {})
+        self.monitor = monitor
+        self.progress = None
+        self.total_burst = sum(p.duration for p in processes) or 1
+        self._prefixes = {}
+        self._cache = {}
+        self.evaluations = 0
+        self.work = 0.0  # Em execuções completas (pelo tempo de CPU simulado)
+        self.ticks = 0
+
+    def _prefix(self, size):
+        if size not in self._prefixes:
+            self._prefixes[size] = prefix(self.processes, size)
+        return self._prefixes[size]
+
+    def switch_limit(self, size):
+        """
+        Limite de trocas no prefixo: proporcional ao número de processos
+        (o limite informado vale para a carga inteira).
+        """
+        if self.max_switches is None:
+            return None
+        return self.max_switches * size / len(self.processes)
+
+    def evaluate(self, params, size):
+        """Simula a combinação no prefixo de 'size' processos (com cache)."""
+        key = (params, size)
+        if key in self._cache:
+            return self._cache[key]
+        quantum, aging = params
+        config = dict(self.config)
+        if quantum is not None:
+            config['quantum'] = quantum
+        if aging is not None:
+            config['aging'] = aging
+
+        subset = self._prefix(size)
+        weight = sum(p.duration for p in subset) / self.total_burst
+        monitor = None
+        if self.progress is not None:
+            self.progress.weight = weight
+            monitor = self.progress
+        run = SimulationRun(diagram=False, monitor=monitor)
+        processes_copy = [p.clone() for p in subset]
+        avg_tt, avg_wt, switches, _ = self.simulator.strategies[self.algorithm].schedule(processes_copy, config, run)
+
+        waits = [p.waiting_time for p in run.completed]
+        turnarounds = [p.turnaround_time for p in run.completed]
+        limit = self.switch_limit(size)
+        excess = 0.0 if limit is None else max(0.0, switches - limit) / max(limit, 1.0)
+        result = {
+            'params': params,
+            'processes': size,
+            'score': OBJECTIVES[self.objective](waits, turnarounds),
+            'excess': excess,
+            'contextSwitches': switches,
+            'avgWaitingTime': avg_wt,
+            'avgTurnaroundTime': avg_tt,
+            'makespan': run.makespan,
+        }
+        self._cache[key] = result
+        self.evaluations += 1
+        self.work += weight
+        self.ticks += run.makespan
+        if self.progress is not None:
+            self.progress.finish(weight)
+        return result
+
+    @staticmethod
+    def rank_key(result):
+        """
+        Viáveis primeiro (pelo objetivo); inviáveis pelo excesso de trocas.
+        Empates no objetivo (comuns em percentis de prefixos pequenos) são
+        desfeitos pela espera média, menos ruidosa, e depois pelas trocas de
+        contexto; por fim vence o maior quantum/aging (menos trocas).
+        """
+        quantum, aging = result['params']
+        return (result['excess'] > 0, result['excess'], result['score'], result['avgWaitingTime'],
+                result['contextSwitches'], -(quantum or 0), -(aging or 0))
+
+    def describe(self, result):
+        """Resultado de uma avaliação no formato da API."""
+        quantum, aging = result['params']
+        info = {}
+        if quantum is not None:
+            info['quantum'] = quantum
+        if aging is not None:
+            info['aging'] = aging
+        info.update({
+            'score': result['score'],
+            'feasible': result['excess'] == 0,
+            'contextSwitches': result['contextSwitches'],
+            'avgWaitingTime': result['avgWaitingTime'],
+            'avgTurnaroundTime': result['avgTurnaroundTime'],
+            'makespan': result['makespan'],
+        })
+        return info
+
+    def _summary(self, grid, ranked, rungs_info, leaderboard=5):
+        best = ranked[0]
+        return {
+            'algorithm': self.algorithm,
+            'objective': self.objective,
+            'maxContextSwitches': self.max_switches,
+            'best': self.describe(best),
+            'feasible': best['excess'] == 0,
+            'leaderboard': [self.describe(r) for r in ranked[:leaderboard]],
+            'rungs': rungs_info,
+            'gridSize': len(grid),
+            'evaluations': self.evaluations,
+            # Custo em execuções completas; a busca exaustiva custa gridSize
+            'fullRunEquivalents': round(self.work, 3),
+            'simulatedTicks': self.ticks,
+        }
+
+    def successive_halving(self, grid, eta=DEFAULT_ETA, min_processes=MIN_PROCESSES):
+        """Busca por successive halving; retorna o resumo (melhor, rodadas, custo)."""
+        if not grid:
+            raise ValueError("Grade de parâmetros vazia.")
+        n = len(self.processes)
+        rungs = plan(len(grid), n, eta, min_processes)
+        if self.monitor is not None:
+            self.progress = _Progress(self.monitor, planned_work(rungs, n))
+
+        survivors = list(grid)
+        rungs_info = []
+        for i, (size, _) in enumerate(rungs):
+            ranked = sorted((self.evaluate(params, size) for params in survivors), key=self.rank_key)
+            rungs_info.append({
+                'processes': size,
+                'candidates': len(survivors),
+                'best': self.describe(ranked[0]),
+            })
+            if i < len(rungs) - 1:
+                survivors = [r['params'] for r in ranked[:rungs[i + 1][1]]]
+        return self._summary(grid, ranked, rungs_info)
+
+    def exhaustive(self, grid):
+        """Referência: todas as combinações na carga inteira."""
+        n = len(self.processes)
+        if self.monitor is not None:
+            self.progress = _Progress(self.monitor, len(grid))
+        ranked = sorted((self.evaluate(params, n) for params in grid), key=self.rank_key)
+        return self._summary(grid, ranked, [{'processes': n, 'candidates': len(grid),
+                                             'best': self.describe(ranked[0])}])
+
+
+def optimize(algorithm, processes, objective=DEFAULT_OBJECTIVE, max_switches=None, quanta=None,
+             agings=None, eta=DEFAULT_ETA, min_processes=MIN_PROCESSES, config=None,
+             simulator=None, monitor=None, exhaustive=False):
+    """
+    Procura a melhor combinação de quantum/aging para 'processes'.
+    'quanta'/'agings' = None usam a grade padrão; 'exhaustive' avalia a
+    grade inteira na carga completa (lento; para conferência).
+    """
+    tuner = Tuner(algorithm, processes, objective, max_switches, config, simulator, monitor)
+    grid = build_grid(tuner.spec, processes, quanta, agings)
+    if exhaustive:
+        return tuner.exhaustive(grid)
+    return tuner.successive_halving(grid, eta, min_processes)
+
+
+def _format_params(info):
+    return ', '.join(f"{k}={info[k]}" for k in ('quantum', 'aging') if k in info)
+
+def _int_list(text):
+    return [int(v) for v in text.split(',') if v.strip()]
+
+
+# --- Ponto de Entrada do Programa ---
+if __name__ == "__main__":
+    # Uso: python tuning.py RoundRobinPriorityAging --max-switches 400 < processos.txt
+    parser = argparse.ArgumentParser(description="Ajuste de quantum/aging por successive halving.")
+    parser.add_argument('algorithm', help="Estratégia com quantum e/ou aging (ex: RoundRobin).")
+    parser.add_argument('--objective', default=DEFAULT_OBJECTIVE, choices=list(OBJECTIVES))
+    parser.add_argument('--max-switches', type=int, default=None,
+                        help="Limite de trocas de contexto na carga inteira.")
+    parser.add_argument('--quanta', type=_int_list, default=None, help="Valores de quantum (ex: 1,2,4,8).")
+    parser.add_argument('--agings', type=_int_list, default=None, help="Valores de aging (ex: 0,1,2).")
+    parser.add_argument('--eta', type=int, default=DEFAULT_ETA, help="Fator de corte por rodada.")
+    parser.add_argument('--min-processes', type=int, default=MIN_PROCESSES, help="Menor prefixo avaliado.")
+    parser.add_argument('--exhaustive', action='store_true',
+                        help="Roda também a busca exaustiva e compara (lento).")
+    parser.add_argument('--json', action='store_true', help="Imprime o resultado em JSON.")
+    parser.add_argument('--config', default="config.txt")
+    args = parser.parse_args()
+
+    simulator = SchedulerSimulator()
+    simulator.load_config(args.config)
+    simulator.load_processes_from_stdin()
+    if not simulator.processes:
+        print("Nenhum processo válido foi fornecido.", file=sys.stderr)
+        sys.exit(1)
+
+    options = dict(objective=args.objective, max_switches=args.max_switches, quanta=args.quanta,
+                   agings=args.agings, config=simulator.config, simulator=simulator)
+    try:
+        result = optimize(args.algorithm, simulator.processes, eta=args.eta,
+                          min_processes=args.min_processes, **options)
+        reference = optimize(args.algorithm, simulator.processes, exhaustive=True, **options) \
+            if args.exhaustive else None
+    except ValueError as e:
+        print(f"Erro: {e}", file=sys.stderr)
+        sys.exit(1)
+
+    if args.json:
+        if reference is not None:
+            result['exhaustive'] = reference
+        print(json.dumps(result, indent=2, ensure_ascii=False))
+        sys.exit(0)
+
+    print(f"Objetivo: minimizar {result['objective']}"
+          + (f" com no máximo {args.max_switches} trocas de contexto" if args.max_switches is not None else ""))
+    for i, rung in enumerate(result['rungs'], 1):
+        best = rung['best']
+        print(f"Rodada {i}: {rung['candidates']} candidatos em {rung['processes']} processos"
+              f" -> melhor {_format_params(best)} ({best['score']:.3f})")
+    best = result['best']
+    print(f"\nMelhor: {_format_params(best)}")
+    print(f"{result['objective']}: {best['score']:.3f}")
+    print(f"Trocas de contexto: {best['contextSwitches']}" + ("" if best['feasible'] else " (excede o limite!)"))
+    print(f"Tempo médio de espera (tw): {best['avgWaitingTime']:.2f}")
+    print(f"Tempo médio de vida (tt): {best['avgTurnaroundTime']:.2f}")
+    print(f"Custo: {result['fullRunEquivalents']:.2f} execuções completas ({result['evaluations']} avaliações);"
+          f" busca exaustiva: {result['gridSize']}")
+    if reference is not None:
+        ref = reference['best']
+        print(f"\nExaustiva: {_format_params(ref)} ({ref['score']:.3f})"
+              + (" - mesma escolha" if _format_params(ref) == _format_params(best) else ""))
@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+
+import json
+import gzip
+
+try:
+    import msgpack  # Opcional: habilita application/x-msgpack
+except ImportError:
+    msgpack = None
+
+try:
+    import brotli  # Opcional: habilita Content-Encoding: br
+except ImportError:
+    brotli = None
+
+"""
+Formatos de resposta negociados por /api/simulate:
+- json (padrão): formato atual, com diagramData e rawDiagram.
+- compact: o diagrama vai como trechos (RLE) com códigos inteiros de
+  estado em 'diagramRuns', sem diagramData/rawDiagram.
+- msgpack: o formato compact serializado em MessagePack.
+Qualquer formato pode ser comprimido com gzip ou brotli (Accept-Encoding).
+"""
+
+JSON, COMPACT, MSGPACK = 'json', 'compact', 'msgpack'
+
+MIMETYPES = {
+    JSON: 'application/json',
+    COMPACT: 'application/vnd.scheduler.compact+json',
+    MSGPACK: 'application/x-msgpack',
+}
+
+# Respostas menores que isto não compensam a compressão
+MIN_COMPRESS_BYTES = 1024
+
+
+def _accepted(header):
+    """Tokens aceitos em um cabeçalho Accept/Accept-Encoding -> q (ignora q=0)."""
+    tokens = {}
+    for part in (header or '').split(','):
+        token, *params = [p.strip() for p in part.split(';')]
+        quality = 1.0
+        for param in params:
+            key, _, value = param.partition('=')
+            if key.strip() == 'q':
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        if token and quality > 0:
+            token = token.lower()
+            tokens[token] = max(quality, tokens.get(token, 0.0))
+    return tokens
+
+
+def negotiate_format(accept, requested=None):
+    """
+    Escolhe o formato pelo parâmetro ?format= (prioritário) ou pelo
+    cabeçalho Accept (maior q entre os disponíveis; empate fica com JSON,
+    o padrão). Retorna None se o formato pedido não está disponível.
+    """
+    if requested:
+        requested = requested.lower()
+        if requested not in MIMETYPES or (requested == MSGPACK and msgpack is None):
+            return None
+        return requested
+    accepted = _accepted(accept)
+    if not accepted:
+        return JSON
+    # JSON também vale pelos curingas; os demais só se pedidos explicitamente
+    quality = {
+        JSON: accepted.get(MIMETYPES[JSON], accepted.get('application/*', accepted.get('*/*', 0.0))),
+        COMPACT: accepted.get(MIMETYPES[COMPACT], 0.0),
+        MSGPACK: accepted.get(MIMETYPES[MSGPACK], 0.0) if msgpack is not None else 0.0,
+    }
+    # max() fica com o primeiro em caso de empate: JSON, depois compacto
+    return max((JSON, COMPACT, MSGPACK), key=quality.get)
+
+
+def serialize(payload, fmt):
+    """Serializa o payload no formato escolhido. Retorna (bytes, mimetype)."""
+    if fmt == MSGPACK:
+        return msgpack.packb(payload, use_bin_type=True), MIMETYPES[MSGPACK]
+    body = json.dumps(payload, separators=(',', ':'), ensure_ascii=False).encode('utf-8')
+    return body, MIMETYPES[fmt]
+
+
+def compress(body, accept_encoding):
+    """Comprime com brotli ou gzip, se aceitos. Retorna (bytes, encoding ou None)."""
+    if len(body) < MIN_COMPRESS_BYTES:
+        return body, None
+    accepted = _accepted(accept_encoding)
+    br = accepted.get('br', 0.0) if brotli is not None else 0.0
+    gz = accepted.get('gzip', 0.0)
+    if br and br >= gz:
+        return brotli.compress(body, quality=5), 'br'
+    if gz:
+        return gzip.compress(body, compresslevel=6), 'gzip'
+    return body, None
@@ -0,0 +1,215 @@
+#!/usr/bin/env python3
+
+import os
+import sys
+import mmap
+import time
+import struct
+import hashlib
+import tempfile
+from array import array
+from collections import OrderedDict
+
+from SchedulerNoGUI import Process
+
+"""
+Armazenamento de cargas (workloads) enviadas uma única vez e referenciadas
+por um identificador (handle). Cada carga é gravada em um arquivo binário
+compacto e lida via mmap, sem cópia, por qualquer processo trabalhador que
+enxergue o mesmo diretório. Cargas expiram por tempo (TTL) ou tamanho total.
+"""
+
+# Cabeçalho: magic, nº de processos, nº total de rajadas, reservado
+_HEADER = struct.Struct('<4sIII')
+_MAGIC = b'SWL1'
+_RECORD_FIELDS = 4  # creation_time, priority, tickets (-1 = derivado), nº de rajadas
+_NO_TICKETS = -1
+
+STORE_DIR = os.environ.get('SCHEDULER_WORKLOAD_DIR',
+                           os.path.join(tempfile.gettempdir(), 'scheduler-workloads'))
+MAX_BYTES = int(os.environ.get('SCHEDULER_WORKLOAD_MAX_BYTES', 256 * 1024 * 1024))
+TTL_SECONDS = int(os.environ.get('SCHEDULER_WORKLOAD_TTL', 3600))
+
+
+class WorkloadNotFound(LookupError):
+    """Handle desconhecido ou já expirado."""
+
+
+class WorkloadTooLarge(ValueError):
+    """Carga maior que o limite total do armazenamento."""
+    def __init__(self, nbytes, max_bytes):
+        super().__init__(f"Carga de {nbytes} bytes excede o limite do armazenamento ({max_bytes} bytes).")
+        self.nbytes = nbytes
+        self.max_bytes = max_bytes
+
+
+def _int32_array(values):
+    data = array('i', values)
+    if sys.byteorder != 'little':
+        data.byteswap()
+    return data
+
+
+def encode_workload(processes):
+    """Serializa uma lista de Process no formato binário do armazenamento."""
+    records = []
+    bursts = []
+    for p in processes:
+        tickets = p.tickets if p.tickets is not None else _NO_TICKETS
+        records.extend((p.creation_time, p.static_priority, tickets, len(p.bursts)))
+        bursts.extend(p.bursts)
+    header = _HEADER.pack(_MAGIC, len(processes), len(bursts), 0)
+    return header + _int32_array(records).tobytes() + _int32_array(bursts).tobytes()
+
+
+class StoredWorkload:
+    """Visão somente leitura (mmap, sem cópia) de uma carga armazenada."""
+    def __init__(self, handle, mapped):
+        magic, count, total_bursts, _ = _HEADER.unpack_from(mapped, 0)
+        if magic != _MAGIC:
+            raise ValueError(f"Carga '{handle}' corrompida.")
+        self.handle = handle
+        self.count = count
+        self.nbytes = len(mapped)
+        self._mapped = mapped
+        values = memoryview(mapped)[_HEADER.size:].cast('i')
+        if sys.byteorder != 'little':
+            # Em máquinas big-endian não há como evitar a cópia
+            values = _int32_array(values)
+        self.records = values[:count * _RECORD_FIELDS]
+        self.bursts = values[count * _RECORD_FIELDS:count * _RECORD_FIELDS + total_bursts]
+
+    def __iter__(self):
+        """Itera (creation_time, priority, tickets, bursts) por processo."""
+        offset = 0
+        for i in range(self.count):
+            base = i * _RECORD_FIELDS
+            creation, priority, tickets, n_bursts = self.records[base:base + _RECORD_FIELDS]
+            yield creation, priority, tickets, self.bursts[offset:offset + n_bursts]
+            offset += n_bursts
+
+    @property
+    def cpu_only(self):
+        """Indica se nenhum processo tem E/S ou bilhetes explícitos."""
+        return all(len(b) == 1 and t == _NO_TICKETS for _, _, t, b in self)
+
+    def to_processes(self):
+        """Cria objetos Process novos (ids P1..Pn) a partir da carga."""
+        processes = []
+        for i, (creation, priority, tickets, bursts) in enumerate(self):
+            processes.append(Process(
+                f"P{i+1}", creation, bursts[0], priority,
+                tickets=None if tickets == _NO_TICKETS else tickets,
+                bursts=list(bursts) if len(bursts) > 1 else None
+            ))
+        return processes
+
+    def to_tuples(self):
+        """(criação, duração, prioridade) por processo, para o motor vetorizado."""
+        return [(creation, sum(bursts[0::2]), priority) for creation, priority, _, bursts in self]
+
+
+class WorkloadStore:
+    """
+    Diretório de cargas endereçadas pelo conteúdo (o handle é um hash),
+    compartilhado entre processos. Cada processo mantém um pequeno cache
+    de arquivos já mapeados.
+    """
+    def __init__(self, directory=STORE_DIR, max_bytes=MAX_BYTES, ttl=TTL_SECONDS, cache_size=32):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.cache_size = cache_size
+        self._mapped = OrderedDict()  # handle -> StoredWorkload (LRU)
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, handle):
+        if not handle.isalnum():
+            raise WorkloadNotFound(handle)
+        return os.path.join(self.directory, f"{handle}.wl")
+
+    def put(self, processes):
+        """
+        Armazena a carga (se ainda não existir) e retorna seu handle.
+        Lança WorkloadTooLarge se ela sozinha excede 'max_bytes' (seria
+        removida logo em seguida pela limpeza por tamanho).
+        """
+        payload = encode_workload(processes)
+        if len(payload) > self.max_bytes:
+            raise WorkloadTooLarge(len(payload), self.max_bytes)
+        handle = hashlib.sha256(payload).hexdigest()[:24]
+        path = self._path(handle)
+        if os.path.exists(path):
+            os.utime(path)  # Renova o TTL
+        else:
+            # Escrita atômica: outros processos nunca veem arquivo parcial
+            tmp_path = f"{path}.{os.getpid()}.tmp"
+            with open(tmp_path, 'wb') as f:
+                f.write(payload)
+            os.replace(tmp_path, path)
+        self.evict()
+        return handle
+
+    def get(self, handle):
+        """Retorna a carga mapeada em memória ou lança WorkloadNotFound."""
+        path = self._path(handle)
+        try:
+            stat = os.stat(path)
+        except FileNotFoundError:
+            self._mapped.pop(handle, None)
+            raise WorkloadNotFound(handle)
+        if time.time() - stat.st_mtime > self.ttl:
+            self.delete(handle)
+            raise WorkloadNotFound(handle)
+
+        workload = self._mapped.get(handle)
+        if workload is None:
+            with open(path, 'rb') as f:
+                mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            workload = StoredWorkload(handle, mapped)
+            self._mapped[handle] = workload
+            if len(self._mapped) > self.cache_size:
+                self._mapped.popitem(last=False)
+        self._mapped.move_to_end(handle)
+        os.utime(path)  # Uso recente: último a ser removido por tamanho
+        return workload
+
+    def delete(self, handle):
+        """Remove a carga; retorna False se ela não existia."""
+        self._mapped.pop(handle, None)
+        try:
+            os.remove(self._path(handle))
+            return True
+        except FileNotFoundError:
+            return False
+
+    def _entries(self):
+        entries = []
+        for name in os.listdir(self.directory):
+            if not name.endswith('.wl'):
+                continue
+            try:
+                stat = os.stat(os.path.join(self.directory, name))
+            except FileNotFoundError:
+                continue  # Removido por outro processo
+            entries.append((stat.st_mtime, stat.st_size, name[:-3]))
+        return entries
+
+    def stats(self):
+        """Quantidade de cargas e bytes ocupados no diretório."""
+        entries = self._entries()
+        return {'workloads': len(entries), 'bytes': sum(size for _, size, _ in entries)}
+
+    def evict(self):
+        """Remove cargas expiradas e, se preciso, as menos usadas recentemente."""
+        now = time.time()
+        entries = sorted(self._entries())
+        total = sum(size for _, size, _ in entries)
+        for mtime, size, handle in entries:
+            if now - mtime <= self.ttl and total <= self.max_bytes:
+                break
+            try:
+                self.delete(handle)
+            except OSError:
+                continue  # Ex: arquivo ainda mapeado no Windows
+            total -= size